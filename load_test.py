@@ -0,0 +1,360 @@
+"""Load-test harness for the GeoAI Toolkit.
+
+Starts main.py under `streamlit run` with local stand-in Nominatim/OSRM servers
+upstream, then drives scripted sessions concurrently against that one server
+over its websocket, the way browsers do. Each concurrency level records rerun
+latency percentiles, server RSS growth per session and upstream request counts.
+
+What the numbers represent:
+- Latency runs from sending a rerun to the server's "script finished" message.
+  It includes queueing behind other sessions in the same process (GIL,
+  st.cache_* locks, the shared geocoding/routing paths) but not browser
+  rendering or network distance to real users.
+- RSS growth is the server's resident memory once a level's sessions have
+  finished (while still connected) minus before, per session. It covers
+  session and widget state plus per-session message caches. The server does
+  not hand freed memory back promptly and keeps disconnected sessions for a
+  while, so later levels can read low or noisy; compare runs, not single rows.
+- Session-state size on its own is not observable from outside the server.
+- Upstream counts are the requests reaching the stand-ins during a level.
+
+    python load_test.py --levels 1 2 4 8 --upstream-latency 50 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import polyline
+import websockets
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+# Configuration
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+RERUN_TIMEOUT = 60
+SERVER_START_TIMEOUT = 60
+WIDGET_TYPES = ("radio", "selectbox", "text_input", "button")
+
+class UpstreamStats:
+    """Thread-safe request counters for the stand-in servers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, service):
+        with self.lock:
+            self.counts[service] = self.counts.get(service, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+def make_handler(stats, latency):
+    """Build a request handler answering like Nominatim /search and OSRM /route"""
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if latency:
+                time.sleep(latency)
+
+            if url.path.startswith("/search"):
+                stats.record("nominatim")
+                query = parse_qs(url.query).get("q", [""])[0]
+                # Derive stable coordinates from the query so different addresses differ
+                seed = sum(map(ord, query))
+                body = [{
+                    "lat": str(31.5 + (seed % 100) / 1000),
+                    "lon": str(74.3 + (seed % 77) / 1000),
+                    "display_name": f"{query} (stand-in)",
+                    "type": "stand_in"
+                }]
+            elif url.path.startswith("/route/v1/"):
+                stats.record("osrm")
+                coords = url.path.rsplit("/", 1)[-1].split(";")
+                (lon1, lat1), (lon2, lat2) = [map(float, c.split(",")) for c in coords[:2]]
+                points = [(lat1 + (lat2 - lat1) * i / 50, lon1 + (lon2 - lon1) * i / 50) for i in range(51)]
+                body = {
+                    "code": "Ok",
+                    "routes": [{
+                        "geometry": polyline.encode(points),
+                        "distance": 5000.0,
+                        "duration": 600.0,
+                        "legs": [{
+                            "distance": 5000.0,
+                            "duration": 600.0,
+                            "annotation": {"distance": [100.0] * 50, "duration": [12.0] * 50},
+                            "steps": [
+                                {"name": "Start Road", "distance": 2500.0, "duration": 300.0,
+                                 "geometry": polyline.encode(points[:26]),
+                                 "maneuver": {"type": "depart", "location": [lon1, lat1]}},
+                                {"name": "End Road", "distance": 2500.0, "duration": 300.0,
+                                 "geometry": polyline.encode(points[25:]),
+                                 "maneuver": {"type": "arrive", "location": [lon2, lat2]}}
+                            ]
+                        }]
+                    }],
+                    "waypoints": [
+                        {"name": "Start Road", "location": [lon1, lat1]},
+                        {"name": "End Road", "location": [lon2, lat2]}
+                    ]
+                }
+            else:
+                stats.record("other")
+                self.send_error(404)
+                return
+
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+def start_stand_in_server(stats, latency):
+    """Serve Nominatim and OSRM stand-ins on a free local port and point the app at them"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(stats, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    os.environ["OSRM_URL"] = f"http://{host}:{port}/route/v1"
+    os.environ["NOMINATIM_DOMAIN"] = f"{host}:{port}"
+    os.environ["NOMINATIM_SCHEME"] = "http"
+    return server
+
+def start_streamlit_server(log):
+    """Run main.py under `streamlit run` on a free local port; the stand-in settings are inherited"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = subprocess.Popen([
+        sys.executable, "-m", "streamlit", "run", APP_FILE,
+        "--server.headless", "true",
+        "--server.address", "127.0.0.1",
+        "--server.port", str(port),
+        "--server.fileWatcherType", "none",
+        "--server.enableXsrfProtection", "false",
+        "--browser.gatherUsageStats", "false"
+    ], stdout=log, stderr=subprocess.STDOUT)
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).read()
+            return process, f"ws://127.0.0.1:{port}/_stcore/stream"
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    log.seek(0)
+    raise RuntimeError(f"Streamlit server did not start:\n{log.read().decode(errors='replace')}")
+
+def process_rss(pid):
+    """Resident set size of a process in bytes"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+class StreamlitSession:
+    """One browser-like client speaking the Streamlit websocket protocol"""
+
+    def __init__(self, url):
+        self.url = url
+        self.websocket = None
+        self.widgets = {}  # (type, label) and (type, key) -> widget id, from the last run
+        self.states = {}  # widget id -> WidgetState, resent with every rerun like the frontend does
+        self.latencies = []
+        self.errors = []
+
+    async def connect(self):
+        self.websocket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+
+    def widget(self, element_type, name):
+        try:
+            return self.widgets[(element_type, name)]
+        except KeyError:
+            raise LookupError(f"No {element_type} '{name}' in the last run") from None
+
+    def set_value(self, element_type, name, value):
+        """Change a widget's value; it is sent with the next rerun"""
+        widget_id = self.widget(element_type, name)
+        self.states[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    async def rerun(self, triggers=()):
+        """Request a script run and wait for it to finish, collecting widgets and errors"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        live = set(self.widgets.values())
+        msg.rerun_script.widget_states.widgets.extend(s for i, s in self.states.items() if i in live)
+        msg.rerun_script.widget_states.widgets.extend(WidgetState(id=i, trigger_value=True) for i in triggers)
+
+        start = time.perf_counter()
+        await self.websocket.send(msg.SerializeToString())
+        widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.websocket.recv(), RERUN_TIMEOUT))
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                widgets = {}
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.errors.append(element.exception.message)
+                elif element_type == "alert" and element.alert.format == Alert.ERROR:
+                    self.errors.append(element.alert.body)
+                elif element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    widgets[(element_type, widget.label)] = widget.id
+                    widgets[(element_type, widget.id.split("-", 2)[-1])] = widget.id  # ids end in the user key
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.latencies.append(time.perf_counter() - start)
+        self.widgets = widgets
+
+    async def select(self, label, value):
+        self.set_value("radio", label, value)
+        await self.rerun()
+
+    async def click(self, label):
+        await self.rerun(triggers=[self.widget("button", label)])
+
+async def run_session(session, session_id):
+    """Connect and run one scripted user journey, recording per-rerun latencies"""
+    try:
+        await session.connect()
+        await session.rerun()
+
+        # Plan a route
+        await session.select("Select Tool", "Route Planner")
+        session.set_value("text_input", "start_addr", f"Depot {session_id}, Lahore, Pakistan")
+        session.set_value("text_input", "end_addr", f"Customer {session_id}, Lahore, Pakistan")
+        await session.click("Set Start Location")
+        await session.click("Set End Location")
+        await session.click("Calculate Route")
+
+        # Read it back from the downstream tabs
+        for tab in ["Extract Time", "Extract Distance", "Route Analysis", "Route Map"]:
+            await session.select("Select Tool", tab)
+
+        # Geocode an address
+        await session.select("Select Tool", "Address Geocoding")
+        session.set_value("text_input", "geocode_address", f"Office {session_id}, Lahore, Pakistan")
+        await session.click("📍 Geocode Address")
+    except (LookupError, OSError, asyncio.TimeoutError, websockets.ConnectionClosed) as e:
+        session.errors.append(f"{type(e).__name__}: {e}")
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_level(url, concurrency, stats, server_pid):
+    """Run `concurrency` sessions at once against the server and summarize the level"""
+    before_upstream = stats.snapshot()
+    rss_before = process_rss(server_pid)
+    sessions = [StreamlitSession(url) for _ in range(concurrency)]
+    start = time.perf_counter()
+
+    await asyncio.gather(*(run_session(s, f"{concurrency}-{i}") for i, s in enumerate(sessions)))
+
+    elapsed = time.perf_counter() - start
+    rss_after = process_rss(server_pid)  # sessions are still connected, so their state is resident
+    after_upstream = stats.snapshot()
+    await asyncio.gather(*(s.close() for s in sessions))
+
+    latencies = [lat for s in sessions for lat in s.latencies]
+    upstream = {k: after_upstream.get(k, 0) - before_upstream.get(k, 0) for k in after_upstream}
+    return {
+        "concurrency": concurrency,
+        "reruns": len(latencies),
+        "wall_time_s": elapsed,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p90_ms": percentile(latencies, 90) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "server_rss_mb": rss_after / 2**20,
+        "rss_growth_per_session_mb": (rss_after - rss_before) / concurrency / 2**20,
+        "upstream_requests": upstream,
+        "errors": [e for s in sessions for e in s.errors]
+    }
+
+async def run_levels(url, levels, stats, server_pid):
+    # One unmeasured session first so the server's imports and caches don't count as growth
+    warmup = StreamlitSession(url)
+    await run_session(warmup, "warmup")
+    await warmup.close()
+    if warmup.errors:
+        print(f"Warm-up session error(s), first: {warmup.errors[0]}")
+    return [await run_level(url, level, stats, server_pid) for level in levels]
+
+def print_table(rows):
+    header = f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'MB/sess':>8}  upstream"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        upstream = ", ".join(f"{k}={v}" for k, v in sorted(row["upstream_requests"].items()))
+        print(f"{row['concurrency']:>8} {row['reruns']:>7} {row['latency_p50_ms']:>8.1f} {row['latency_p90_ms']:>8.1f} "
+              f"{row['latency_p99_ms']:>8.1f} {row['server_rss_mb']:>8.1f} {row['rss_growth_per_session_mb']:>8.2f}  {upstream}")
+        if row["errors"]:
+            print(f"         {len(row['errors'])} session error(s), first: {row['errors'][0]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent Streamlit sessions of the GeoAI Toolkit")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to ramp through")
+    parser.add_argument("--upstream-latency", type=float, default=0.0,
+                        help="Artificial latency of the stand-in servers in milliseconds")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    stats = UpstreamStats()
+    stand_in = start_stand_in_server(stats, args.upstream_latency / 1000)
+    with tempfile.TemporaryFile() as log:
+        server, url = start_streamlit_server(log)
+        try:
+            rows = asyncio.run(run_levels(url, args.levels, stats, server.pid))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+            stand_in.shutdown()
+
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import streamlit as st
-from tabs import about, extract_distance, extract_time, geocoding, distance, route, route_map, poi
+from tabs import profiling, warm_cache
+from tabs import about, extract_distance, extract_time, geocoding, distance, route, route_map, poi, export, geofence, heatmap, route_analysis
 
 # Set page config
 st.set_page_config(page_title="🌍 GeoAI Toolkit", layout="wide")
 
+# Map the warm-start bundle (if deployed) once per process so known locations are served locally
+warm_cache.get_bundle()
+
 # Sidebar with app info
 with st.sidebar:
     st.title("🌍 GeoAI Toolkit")
@@ -14,6 +18,8 @@ with st.sidebar:
     st.write("---")
     st.write("**About**")
     st.write("This server provides geographic calculation tools including geocoding, distance calculation, route planning, and points of interest search.")
+    st.write("---")
+    profile_mode = profiling.sidebar_controls()
 
 # Create tabs
 tabs = {
@@ -23,8 +29,12 @@ tabs = {
     "Route Planner": route,
     "Extract Time": extract_time,
     "Extract Distance": extract_distance,
+    "Route Analysis": route_analysis,
     "Route Map": route_map,
-    "Points of Interest": poi
+    "Points of Interest": poi,
+    "Export Data": export,
+    "Geofencing": geofence,
+    "Density Heatmap": heatmap
 }
 
 
@@ -32,4 +42,8 @@ tabs = {
 current_tab = st.radio("Select Tool", list(tabs.keys()), horizontal=True)
 
 # Display the selected tab
-tabs[current_tab].show()
\ No newline at end of file
+with profiling.rerun(profile_mode) as profile_results:
+    with profiling.span(f"{current_tab}.show"):
+        tabs[current_tab].show()
+
+profiling.report(profile_results)
\ No newline at end of file
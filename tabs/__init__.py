@@ -6,6 +6,10 @@ from .extract_time import show as show_extract_time
 from .extract_distance import show as show_extract_distance
 from .route_map import show as show_route_map
 from .poi import show as show_poi
+from .export import show as show_export
+from .geofence import show as show_geofence
+from .heatmap import show as show_heatmap
+from .route_analysis import show as show_route_analysis
 
 __all__ = [
     'about',
@@ -15,5 +19,9 @@ __all__ = [
     'extract_time',
     'extract_distance',
     'route_map',
-    'poi'
+    'poi',
+    'export',
+    'geofence',
+    'heatmap',
+    'route_analysis'
 ]
\ No newline at end of file
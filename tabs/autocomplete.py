@@ -0,0 +1,212 @@
+import streamlit as st
+import csv
+import os
+import re
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from . import warm_cache
+
+# Configuration
+GAZETTEER_PATH = os.environ.get("GAZETTEER_PATH", os.path.join("data", "gazetteer.csv"))
+MIN_PREFIX_LENGTH = 3
+MAX_SUGGESTIONS = 8
+INITIAL_CAPACITY = 1024  # popularity slots, doubled as entries are added
+COORD_DECIMALS = 5  # ~1 m; same-named places further apart stay separate entries
+
+def normalize(text):
+    """Lower-case and collapse punctuation/whitespace so prefixes match loosely"""
+    return re.sub(r"[\s,]+", " ", text.lower()).strip()
+
+class PrefixIndex:
+    """Sorted-array prefix index over addresses, ranked by popularity"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = []  # (normalized key, entry id), sorted lazily
+        self.key_entries = np.zeros(0, dtype=np.int64)  # entry id per sorted key, for vectorized ranking
+        self.sorted = True
+        self.entries = []  # {"address", "lat", "lon"}
+        self.popularity = np.zeros(INITIAL_CAPACITY, dtype=np.int64)  # indexed by entry id
+        self.by_key = {}  # normalized key -> entry ids; several when a name is ambiguous
+        self.by_location = {}  # (normalized address, rounded lat, rounded lon) -> entry id
+
+    @staticmethod
+    def _location_key(address, lat, lon):
+        return normalize(address), round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS)
+
+    def add(self, key, address, lat, lon, popularity=1):
+        """Index `key` (a query or an address) for a location, or bump its popularity"""
+        norm = normalize(key)
+        if not norm:
+            return
+        with self.lock:
+            # An entry is a place: the same name at other coordinates is a different entry
+            location = self._location_key(address, lat, lon)
+            entry_id = self.by_location.get(location)
+            if entry_id is None:
+                entry_id = len(self.entries)
+                self.entries.append({"address": address, "lat": lat, "lon": lon})
+                self.by_location[location] = entry_id
+                if entry_id == len(self.popularity):
+                    self.popularity = np.concatenate([self.popularity, np.zeros_like(self.popularity)])
+            self.popularity[entry_id] += popularity
+
+            # Several keys (an address and its seeded aliases) can share one entry
+            entry_ids = self.by_key.setdefault(norm, [])
+            if entry_id not in entry_ids:
+                entry_ids.append(entry_id)
+                # Appending and re-sorting on the next query keeps bulk loads linear
+                self.keys.append((norm, entry_id))
+                self.sorted = False
+
+    def rebuild(self):
+        """Sort keys added since the last query"""
+        with self.lock:
+            self._ensure_sorted()
+
+    def _ensure_sorted(self):
+        if not self.sorted:
+            self.keys.sort()
+            self.key_entries = np.fromiter((entry_id for _, entry_id in self.keys), dtype=np.int64, count=len(self.keys))
+            self.sorted = True
+
+    def _entry(self, entry_id):
+        return dict(self.entries[entry_id], popularity=int(self.popularity[entry_id]))
+
+    def _top_entries(self, ids, limit):
+        """Most popular distinct entry ids among `ids`, ties in key order"""
+        popularity = self.popularity[ids]
+        candidates = limit
+        while True:
+            if candidates < len(ids):
+                # Everything above the candidates-th largest popularity, then ties in key order
+                threshold = np.partition(popularity, len(ids) - candidates)[len(ids) - candidates]
+                above = np.flatnonzero(popularity > threshold)
+                ties = np.flatnonzero(popularity == threshold)[:candidates - len(above)]
+                picked = np.sort(np.concatenate([above, ties]))
+            else:
+                picked = np.arange(len(ids))
+            ordered = picked[np.argsort(-popularity[picked], kind="stable")]
+            top = list(dict.fromkeys(ids[ordered].tolist()))[:limit]
+            # Keys sharing an entry can crowd the candidates; widen until enough distinct ones
+            if len(top) == limit or candidates >= len(ids):
+                return top
+            candidates *= 4
+
+    def suggest(self, prefix, limit=MAX_SUGGESTIONS):
+        """Return the most popular distinct locations whose key starts with `prefix`"""
+        norm = normalize(prefix)
+        if len(norm) < MIN_PREFIX_LENGTH:
+            return []
+        with self.lock:
+            self._ensure_sorted()
+            # Matches form one contiguous slice of the sorted keys, ranked as a whole
+            start = bisect_left(self.keys, (norm, -1))
+            end = bisect_left(self.keys, (norm + "\uffff", -1), start)
+            return [self._entry(i) for i in self._top_entries(self.key_entries[start:end], limit)]
+
+    def lookup(self, text):
+        """Resolve an exact (normalized) query or address locally; None if unknown or ambiguous"""
+        with self.lock:
+            entry_ids = self.by_key.get(normalize(text), [])
+            return self._entry(entry_ids[0]) if len(entry_ids) == 1 else None
+
+    def bump(self, address, lat, lon, amount=1):
+        """Count a use of an indexed place towards its popularity"""
+        with self.lock:
+            entry_id = self.by_location.get(self._location_key(address, lat, lon))
+            if entry_id is not None:
+                self.popularity[entry_id] += amount
+
+def load_gazetteer(index, path):
+    """Seed the index from a CSV with name, latitude, longitude and optional popularity columns"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            index.add(row["name"], row["name"], float(row["latitude"]), float(row["longitude"]),
+                      int(float(row.get("popularity") or 1)))
+    index.rebuild()
+
+@st.cache_resource(show_spinner=False)
+def get_index():
+    """Process-wide index shared by all sessions, seeded from the local gazetteer and warm-start bundle
+
+    Only seeded entries and resolved addresses go in here; the free text each
+    user typed stays in their own session (see `session_aliases`).
+    """
+    index = PrefixIndex()
+    if os.path.exists(GAZETTEER_PATH):
+        try:
+            load_gazetteer(index, GAZETTEER_PATH)
+        except (OSError, KeyError, ValueError) as e:
+            st.warning(f"Could not load gazetteer {GAZETTEER_PATH}: {str(e)}")
+
+    # Bundled geocodes resolve locally like any other known address
+    bundle = warm_cache.get_bundle()
+    if bundle is not None:
+        for query, address, lat, lon in bundle.geocodes():
+            index.add(address, address, lat, lon)
+            index.add(query, address, lat, lon, popularity=0)
+        index.rebuild()
+    return index
+
+def session_aliases():
+    """This session's typed queries -> resolved location, kept out of the shared index"""
+    return st.session_state.setdefault("autocomplete_aliases", {})
+
+def known(text):
+    """The location a query already resolves to locally, or None"""
+    return session_aliases().get(normalize(text)) or get_index().lookup(text)
+
+def resolve(text):
+    """Resolve a query locally and count the hit towards the address's popularity"""
+    location = known(text)
+    if location:
+        get_index().bump(location["address"], location["lat"], location["lon"])
+    return location
+
+def record_geocode(query, address, lat, lon):
+    """Share a successful geocode's address and remember the typed query for this session"""
+    get_index().add(address, address, lat, lon)
+    if normalize(query) != normalize(address):
+        session_aliases()[normalize(query)] = {"address": address, "lat": lat, "lon": lon}
+
+def suggest(text, limit=MAX_SUGGESTIONS):
+    """This session's own matching queries first, then the most popular shared addresses"""
+    norm = normalize(text)
+    own = [dict(location) for query, location in session_aliases().items()
+           if len(norm) >= MIN_PREFIX_LENGTH and query.startswith(norm)]
+    merged = {}
+    for suggestion in own + get_index().suggest(text, limit):
+        merged.setdefault(PrefixIndex._location_key(suggestion["address"], suggestion["lat"], suggestion["lon"]), suggestion)
+    return list(merged.values())[:limit]
+
+def suggestion_label(suggestion, suggestions):
+    """Address, with coordinates when another suggestion shares the name"""
+    if sum(s["address"] == suggestion["address"] for s in suggestions) > 1:
+        return f"{suggestion['address']} ({suggestion['lat']:.4f}, {suggestion['lon']:.4f})"
+    return suggestion["address"]
+
+def suggestion_box(text, key, on_pick):
+    """Show matching suggestions under an address input and call `on_pick` with the chosen one"""
+    if not text or known(text):
+        return
+    suggestions = suggest(text)
+    if not suggestions:
+        return
+
+    def picked():
+        choice = st.session_state[key]
+        if choice is not None:
+            get_index().bump(choice["address"], choice["lat"], choice["lon"])
+            on_pick(choice)
+
+    st.selectbox(
+        "Suggestions",
+        [None] + suggestions,
+        format_func=lambda s: "— pick a known address —" if s is None else suggestion_label(s, suggestions),
+        key=key,
+        on_change=picked
+    )
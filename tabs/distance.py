@@ -36,6 +36,23 @@ def show():
         
         st.success(f"Distance between points: {distance:.2f} km")
         
+        # Keep computed pairs as a long-format distance matrix for export, keyed by coordinates
+        origin = f"{lat_a:.6f},{lon_a:.6f}"
+        destination = f"{lat_b:.6f},{lon_b:.6f}"
+        if "distance_results" not in st.session_state:
+            st.session_state.distance_results = []
+        if not any(row["origin"] == origin and row["destination"] == destination
+                   for row in st.session_state.distance_results):
+            st.session_state.distance_results.append({
+                "origin": origin,
+                "origin_lat": lat_a,
+                "origin_lon": lon_a,
+                "destination": destination,
+                "destination_lat": lat_b,
+                "destination_lon": lon_b,
+                "distance_km": distance
+            })
+        
         # Display both points on map
         m = folium.Map(location=[(lat_a + lat_b)/2, (lon_a + lon_b)/2], zoom_start=6)
         folium.Marker([lat_a, lon_a], popup="Point A", tooltip="Point A").add_to(m)
@@ -0,0 +1,255 @@
+import streamlit as st
+import io
+import json
+import struct
+from datetime import datetime
+
+# Configuration
+EXPORT_CHUNK_SIZE = 5000
+
+FORMATS = {
+    "GeoJSON": {"extension": "geojson", "mime": "application/geo+json"},
+    "Newline-delimited GeoJSON": {"extension": "geojsonl", "mime": "application/x-ndjson"},
+    "GeoParquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"}
+}
+
+# Property columns per dataset as (name, arrow type); GeoParquet chunks are written against these
+DATASET_FIELDS = {
+    "Route": [
+        ("kind", "string"),
+        ("start_address", "string"),
+        ("end_address", "string"),
+        ("travel_mode", "string"),
+        ("index", "int64"),
+        ("instruction", "string"),
+        ("distance", "double"),
+        ("duration", "double")
+    ],
+    "Points of Interest": [
+        ("kind", "string"),
+        ("name", "string"),
+        ("type", "string"),
+        ("address", "string"),
+        ("distance", "double")
+    ],
+    "Geocoded Addresses": [
+        ("kind", "string"),
+        ("query", "string"),
+        ("address", "string")
+    ],
+    "Distance Matrix": [
+        ("kind", "string"),
+        ("origin", "string"),
+        ("destination", "string"),
+        ("distance_km", "double")
+    ]
+}
+
+def iter_route_records(route_data):
+    """Yield the route line followed by one point per maneuver step"""
+    coordinates = route_data.get("coordinates") or []
+    if coordinates:
+        yield (
+            "LineString",
+            [(lon, lat) for lat, lon in coordinates],  # polyline gives (lat, lon)
+            {
+                "kind": "route",
+                "start_address": route_data.get("start_address"),
+                "end_address": route_data.get("end_address"),
+                "travel_mode": route_data.get("travel_mode"),
+                "distance": route_data.get("distance"),  # in meters
+                "duration": route_data.get("duration")  # in seconds
+            }
+        )
+
+    for i, step in enumerate(route_data.get("steps") or [], 1):
+        location = step.get("maneuver", {}).get("location")
+        if not location:
+            continue
+        yield (
+            "Point",
+            (location[0], location[1]),  # OSRM locations are already (lon, lat)
+            {
+                "kind": "step",
+                "index": i,
+                "instruction": step.get("instruction") or step.get("name", ""),
+                "distance": step.get("distance"),
+                "duration": step.get("duration")
+            }
+        )
+
+def iter_point_records(rows, kind):
+    """Yield point records from dicts carrying latitude/longitude keys"""
+    for row in rows:
+        properties = {k: v for k, v in row.items() if k not in ("latitude", "longitude")}
+        properties["kind"] = kind
+        yield ("Point", (row["longitude"], row["latitude"]), properties)
+
+def iter_distance_records(rows):
+    """Yield one origin-destination line per distance matrix entry"""
+    for row in rows:
+        yield (
+            "LineString",
+            [(row["origin_lon"], row["origin_lat"]), (row["destination_lon"], row["destination_lat"])],
+            {
+                "kind": "distance",
+                "origin": row.get("origin"),
+                "destination": row.get("destination"),
+                "distance_km": row.get("distance_km")
+            }
+        )
+
+def _feature_json(geometry_type, coordinates, properties):
+    """Serialize a single record as a GeoJSON Feature string"""
+    return json.dumps({
+        "type": "Feature",
+        "geometry": {"type": geometry_type, "coordinates": coordinates},
+        "properties": properties
+    }, separators=(",", ":"), default=str)
+
+def write_geojson(records, stream):
+    """Stream records into a GeoJSON FeatureCollection, one feature at a time"""
+    stream.write('{"type":"FeatureCollection","features":[')
+    count = 0
+    for geometry_type, coordinates, properties in records:
+        if count:
+            stream.write(",")
+        stream.write(_feature_json(geometry_type, coordinates, properties))
+        count += 1
+    stream.write("]}")
+    return count
+
+def write_ndjson(records, stream):
+    """Stream records as newline-delimited GeoJSON features"""
+    count = 0
+    for geometry_type, coordinates, properties in records:
+        stream.write(_feature_json(geometry_type, coordinates, properties))
+        stream.write("\n")
+        count += 1
+    return count
+
+def _to_wkb(geometry_type, coordinates):
+    """Encode a Point or LineString as little-endian WKB"""
+    if geometry_type == "Point":
+        return struct.pack("<BIdd", 1, 1, coordinates[0], coordinates[1])
+    if geometry_type == "LineString":
+        flat = [value for point in coordinates for value in point[:2]]
+        return struct.pack(f"<BII{len(flat)}d", 1, 2, len(coordinates), *flat)
+    raise ValueError(f"Unsupported geometry type: {geometry_type}")
+
+def _chunks(records, size):
+    """Group records into lists of at most `size` items"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _parquet_schema(fields):
+    """Arrow schema for a WKB geometry column plus the given property fields"""
+    import pyarrow as pa
+
+    metadata = {
+        b"geo": json.dumps({
+            "version": "1.0.0",
+            "primary_column": "geometry",
+            "columns": {
+                # No "crs" key: GeoParquet then means OGC:CRS84, i.e. (lon, lat) on WGS84
+                "geometry": {"encoding": "WKB", "geometry_types": []}
+            }
+        }).encode()
+    }
+    columns = [pa.field("geometry", pa.binary())]
+    columns.extend(pa.field(name, pa.type_for_alias(arrow_type)) for name, arrow_type in fields)
+    return pa.schema(columns, metadata=metadata)
+
+def write_geoparquet(records, sink, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Stream records into GeoParquet, one row group per chunk, against a fixed property schema"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(fields)
+    names = [name for name, _ in fields]
+    strings = {name for name, arrow_type in fields if arrow_type == "string"}
+    count = 0
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(records, chunk_size):
+            columns = {name: [] for name in ["geometry"] + names}
+            for geometry_type, coordinates, properties in chunk:
+                unknown = set(properties) - set(names)
+                if unknown:
+                    raise ValueError(f"Properties not in the export schema: {', '.join(sorted(unknown))}")
+                columns["geometry"].append(_to_wkb(geometry_type, coordinates))
+                for name in names:
+                    value = properties.get(name)
+                    columns[name].append(str(value) if name in strings and value is not None else value)
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+def export_bytes(records, fmt, fields):
+    """Write records in the chosen format to an in-memory buffer"""
+    if fmt == "GeoParquet":
+        buffer = io.BytesIO()
+        count = write_geoparquet(records, buffer, fields)
+        return buffer.getvalue(), count
+
+    # Encode as features are written rather than building a str and encoding it afterwards
+    buffer = io.BytesIO()
+    stream = io.TextIOWrapper(buffer, encoding="utf-8", newline="\n")
+    if fmt == "GeoJSON":
+        count = write_geojson(records, stream)
+    else:
+        count = write_ndjson(records, stream)
+    stream.flush()
+    stream.detach()  # keep the buffer open once the wrapper is collected
+    return buffer.getvalue(), count
+
+def available_datasets():
+    """Collect the exportable results currently held in the session"""
+    datasets = {}
+    route_data = st.session_state.get("route_data")
+    if route_data and route_data.get("coordinates"):
+        datasets["Route"] = lambda: iter_route_records(route_data)
+    if st.session_state.get("poi_results"):
+        datasets["Points of Interest"] = lambda: iter_point_records(st.session_state.poi_results, "poi")
+    if st.session_state.get("geocoded_locations"):
+        datasets["Geocoded Addresses"] = lambda: iter_point_records(st.session_state.geocoded_locations, "geocode")
+    if st.session_state.get("distance_results"):
+        datasets["Distance Matrix"] = lambda: iter_distance_records(st.session_state.distance_results)
+    return datasets
+
+def show():
+    st.title("Export Data")
+    st.write("Download routes, POIs, geocoded addresses and distances as GeoJSON or GeoParquet")
+
+    datasets = available_datasets()
+    if not datasets:
+        st.warning("No results to export yet. Calculate a route, geocode an address, search POIs or measure a distance first.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        dataset = st.selectbox("Dataset", list(datasets.keys()))
+    with col2:
+        fmt = st.selectbox("Format", list(FORMATS.keys()))
+
+    if st.button("📦 Prepare Export"):
+        try:
+            data, count = export_bytes(datasets[dataset](), fmt, DATASET_FIELDS[dataset])
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{dataset.lower().replace(' ', '_')}_{timestamp}.{FORMATS[fmt]['extension']}"
+            st.success(f"Exported {count} features ({len(data)/1024:.1f} KB)")
+            st.download_button(
+                label="⬇️ Download",
+                data=data,
+                file_name=filename,
+                mime=FORMATS[fmt]["mime"]
+            )
+        except ImportError:
+            st.error("GeoParquet export requires pyarrow. Install it with `pip install pyarrow`.")
+        except Exception as e:
+            st.error(f"Export error: {str(e)}")
@@ -6,6 +6,9 @@ from streamlit_folium import folium_static
 import pandas as pd
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 import re
+from geopy.location import Location
+from . import autocomplete, profiling
+from .route import NOMINATIM_DOMAIN, NOMINATIM_SCHEME
 
 def validate_city_in_address(address, expected_city):
     """Check if the expected city appears in the geocoded address"""
@@ -40,8 +43,11 @@ def show():
 
     address = st.text_input(
         "Enter complete address (include city and country)", 
-        placeholder="E.g., 'Mughal Pura Bus Stop, Lahore, Pakistan'"
+        placeholder="E.g., 'Mughal Pura Bus Stop, Lahore, Pakistan'",
+        key="geocode_address"
     )
+    autocomplete.suggestion_box(address, key="geocode_suggestion",
+                                on_pick=lambda s: st.session_state.update(geocode_address=s["address"]))
     
     zoom_level = st.slider("Map zoom level", 1, 18, 15)
     enable_validation = st.checkbox("Enable city validation", value=True, 
@@ -51,20 +57,30 @@ def show():
         if address:
             with st.spinner("Locating address..."):
                 try:
-                    # Initialize geocoder
-                    geolocator = Nominatim(
-                        user_agent="accurate_geo_app",
-                        timeout=15
-                    )
-                    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-                    
-                    # Geocode with detailed parameters
-                    location = geocode(
-                        address,
-                        exactly_one=True,
-                        addressdetails=True,
-                        language='en'
-                    )
+                    # Known addresses resolve locally without a rate-limited round trip
+                    cached = autocomplete.resolve(address)
+                    if cached:
+                        location = Location(cached["address"], (cached["lat"], cached["lon"]), {"type": "cached"})
+                    else:
+                        # Initialize geocoder
+                        geolocator = Nominatim(
+                            user_agent="accurate_geo_app",
+                            domain=NOMINATIM_DOMAIN,
+                            scheme=NOMINATIM_SCHEME,
+                            timeout=15
+                        )
+                        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+                        
+                        # Geocode with detailed parameters
+                        with profiling.span("nominatim.geocode"):
+                            location = geocode(
+                                address,
+                                exactly_one=True,
+                                addressdetails=True,
+                                language='en'
+                            )
+                        if location:
+                            autocomplete.record_geocode(address, location.address, location.latitude, location.longitude)
                     
                     if location:
                         # Extract expected city from input
@@ -78,6 +94,18 @@ def show():
                         
                         st.success("✅ Location Found")
                         
+                        # Keep a table of geocoded results for export, one row per query and address
+                        if "geocoded_locations" not in st.session_state:
+                            st.session_state.geocoded_locations = []
+                        if not any(row["query"] == address and row["address"] == location.address
+                                   for row in st.session_state.geocoded_locations):
+                            st.session_state.geocoded_locations.append({
+                                "query": address,
+                                "address": location.address,
+                                "latitude": location.latitude,
+                                "longitude": location.longitude
+                            })
+                        
                         # Display core information
                         col1, col2 = st.columns(2)
                         with col1:
@@ -119,7 +147,8 @@ def show():
                             fill_opacity=0.2
                         ).add_to(m)
                         
-                        folium_static(m, width=700, height=500)
+                        with profiling.span("folium.render"):
+                            folium_static(m, width=700, height=500)
                         
                         # Additional tools
                         st.subheader("📍 Location Tools")
@@ -0,0 +1,175 @@
+import streamlit as st
+import folium
+from streamlit_folium import folium_static
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+from . import profiling
+
+# Configuration
+CLASSIFY_CHUNK_SIZE = 250_000  # points per vectorized pass
+OUTSIDE = -1
+
+@st.cache_resource(show_spinner=False)
+def load_zones(geojson_text):
+    """Build prepared geometries and an STR-tree for a GeoJSON polygon set (cached per polygon set)"""
+    import shapely
+    from shapely.geometry import shape
+
+    data = json.loads(geojson_text)
+    features = data.get("features", []) if data.get("type") == "FeatureCollection" else [data]
+
+    geometries = []
+    properties = []
+    for feature in features:
+        geometry = feature.get("geometry")
+        if not geometry or geometry.get("type") not in ("Polygon", "MultiPolygon"):
+            continue
+        geometries.append(shape(geometry))
+        properties.append(feature.get("properties") or {})
+
+    if not geometries:
+        raise ValueError("No Polygon or MultiPolygon features found")
+
+    geometries = np.array(geometries, dtype=object)
+    shapely.prepare(geometries)
+    return {
+        "key": hashlib.sha1(geojson_text.encode("utf-8")).hexdigest(),
+        "geometries": geometries,
+        "properties": properties,
+        "tree": shapely.STRtree(geometries)
+    }
+
+def zone_names(zones, name_property):
+    """Label each zone by the chosen property, falling back to its index"""
+    return [str(props.get(name_property, f"Zone {i+1}")) for i, props in enumerate(zones["properties"])]
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def classify_points(_zones, zones_key, lats, lons):
+    """Return the index of the first zone containing each point, or -1 (cached per polygon set and points)"""
+    import shapely
+
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    result = np.full(len(lats), OUTSIDE, dtype=np.int32)
+
+    for start in range(0, len(lats), CLASSIFY_CHUNK_SIZE):
+        stop = start + CLASSIFY_CHUNK_SIZE
+        points = shapely.points(lons[start:stop], lats[start:stop])
+        point_idx, zone_idx = _zones["tree"].query(points, predicate="intersects")
+        # Assign highest zone indices first so the lowest one wins on overlaps
+        order = np.argsort(-zone_idx, kind="stable")
+        result[start + point_idx[order]] = zone_idx[order]
+    return result
+
+def zones_crossed(zones, coordinates):
+    """List the zones a route crosses, in the order they are entered"""
+    import shapely
+
+    if len(coordinates) < 2:
+        return []
+    line = shapely.linestrings([(lon, lat) for lat, lon in coordinates])  # polyline gives (lat, lon)
+    hits = zones["tree"].query(line, predicate="intersects")
+
+    crossings = []
+    for zone_idx in hits:
+        inside = shapely.intersection(line, zones["geometries"][zone_idx])
+        coords = shapely.get_coordinates(inside)
+        if not len(coords):
+            continue  # the tree can report a touch that intersects to nothing at float precision
+        crossings.append({
+            "zone": int(zone_idx),
+            "entry_fraction": line.project(shapely.points(coords[0]), normalized=True),
+            "share_of_route": shapely.length(inside) / line.length if line.length else 0.0
+        })
+    crossings.sort(key=lambda c: c["entry_fraction"])
+    return crossings
+
+def show():
+    st.title("Geofencing")
+    st.write("Find which zone each point falls in and which zones a route crosses")
+
+    zones_file = st.file_uploader("Zones (GeoJSON polygons)", type=["geojson", "json"])
+    if not zones_file:
+        st.info("Upload a GeoJSON file with delivery zones or administrative areas to begin")
+        return
+
+    try:
+        geojson_text = zones_file.getvalue().decode("utf-8")
+        zones = load_zones(geojson_text)
+    except Exception as e:
+        st.error(f"Could not load zones: {str(e)}")
+        return
+
+    property_keys = sorted({key for props in zones["properties"] for key in props})
+    name_property = st.selectbox("Zone name property", property_keys or ["(index)"])
+    names = zone_names(zones, name_property)
+    st.success(f"Loaded {len(names)} zones")
+
+    # Points to classify
+    st.subheader("1. Classify Points")
+    source = st.radio("Points source", ["Upload CSV", "Geocoded addresses"], horizontal=True)
+    points = None
+    if source == "Upload CSV":
+        points_file = st.file_uploader("Points CSV with latitude and longitude columns", type=["csv"])
+        if points_file:
+            points = pd.read_csv(points_file)
+    elif st.session_state.get("geocoded_locations"):
+        points = pd.DataFrame(st.session_state.geocoded_locations)
+    else:
+        st.warning("No geocoded addresses yet. Use the Address Geocoding tab first.")
+
+    if points is not None:
+        if not {"latitude", "longitude"}.issubset(points.columns):
+            st.error("Points must have 'latitude' and 'longitude' columns")
+        elif st.button("📍 Classify Points"):
+            with st.spinner(f"Classifying {len(points):,} points..."):
+                zone_idx = classify_points(
+                    zones, zones["key"],
+                    points["latitude"].to_numpy(dtype=float),
+                    points["longitude"].to_numpy(dtype=float)
+                )
+            labels = np.array(names + [None], dtype=object)  # -1 maps to the trailing None
+            points = points.assign(zone=labels[zone_idx])
+
+            inside = int((zone_idx != OUTSIDE).sum())
+            st.success(f"{inside:,} of {len(points):,} points fall inside a zone")
+            counts = points["zone"].value_counts().rename_axis("zone").reset_index(name="points")
+            st.dataframe(counts, width="stretch")
+            st.dataframe(points.head(1000), width="stretch")
+            st.download_button(
+                label="⬇️ Download Classified Points",
+                data=points.to_csv(index=False).encode("utf-8"),
+                file_name="classified_points.csv",
+                mime="text/csv"
+            )
+
+    # Route crossings
+    st.subheader("2. Zones Crossed by Route")
+    route_data = st.session_state.get("route_data")
+    if not route_data or not route_data.get("coordinates"):
+        st.info("Plan a route in the Route Planner tab to see which zones it crosses")
+    else:
+        try:
+            crossings = zones_crossed(zones, route_data["coordinates"])
+            if crossings:
+                st.dataframe(pd.DataFrame([{
+                    "Zone": names[c["zone"]],
+                    "Entered at": f"{c['entry_fraction']*100:.0f}% of route",
+                    "Share of route": f"{c['share_of_route']*100:.1f}%"
+                } for c in crossings]), width="stretch")
+            else:
+                st.write("The route does not cross any zone")
+        except Exception as e:
+            st.error(f"Error intersecting route: {str(e)}")
+
+    # Zones map
+    m = folium.Map(tiles="OpenStreetMap")
+    layer = folium.GeoJson(json.loads(geojson_text), name="Zones")
+    layer.add_to(m)
+    if route_data and route_data.get("coordinates"):
+        folium.PolyLine(route_data["coordinates"], color="blue", weight=4, opacity=0.7).add_to(m)
+    m.fit_bounds(layer.get_bounds())
+    with profiling.span("folium.render"):
+        folium_static(m, width=800, height=500)
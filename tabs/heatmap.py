@@ -0,0 +1,255 @@
+import streamlit as st
+import folium
+from folium.plugins import HeatMap
+from streamlit_folium import st_folium
+import branca.colormap as cm
+import numpy as np
+import pandas as pd
+from . import profiling
+
+# Configuration
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_MAX_PRECISION = 8
+HEX_ZOOM_LEVELS = range(2, 17)  # one hex resolution per map zoom level
+HEX_SIZE_AT_ZOOM_0_KM = 3000.0  # halves with every zoom level
+KM_PER_DEGREE = 111.32
+HEX_AXIAL_OFFSET = 1 << 30  # axial coordinates are shifted non-negative before packing
+HEX_AXIAL_SPAN = 1 << 31
+
+def geohash_encode(lats, lons, precision):
+    """Vectorized geohash encoding to integer codes (5 bits per character)"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+
+    lat_q = np.clip(((lats + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64), 0, (1 << lat_bits) - 1).astype(np.uint64)
+    lon_q = np.clip(((lons + 180.0) / 360.0 * (1 << lon_bits)).astype(np.int64), 0, (1 << lon_bits) - 1).astype(np.uint64)
+
+    codes = np.zeros(len(lats), dtype=np.uint64)
+    one = np.uint64(1)
+    for i in range(total_bits):
+        # Bits alternate longitude/latitude, starting with longitude
+        if i % 2 == 0:
+            bit = (lon_q >> np.uint64(lon_bits - 1 - i // 2)) & one
+        else:
+            bit = (lat_q >> np.uint64(lat_bits - 1 - i // 2)) & one
+        codes = (codes << one) | bit
+    return codes
+
+def geohash_bounds(codes, precision):
+    """Return (lat_min, lon_min, lat_size, lon_size) arrays for integer geohash codes"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+
+    lat_q = np.zeros(len(codes), dtype=np.uint64)
+    lon_q = np.zeros(len(codes), dtype=np.uint64)
+    one = np.uint64(1)
+    for i in range(total_bits):
+        bit = (codes >> np.uint64(total_bits - 1 - i)) & one
+        if i % 2 == 0:
+            lon_q = (lon_q << one) | bit
+        else:
+            lat_q = (lat_q << one) | bit
+
+    lat_size = 180.0 / (1 << lat_bits)
+    lon_size = 360.0 / (1 << lon_bits)
+    return lat_q * lat_size - 90.0, lon_q * lon_size - 180.0, lat_size, lon_size
+
+def geohash_to_string(code, precision):
+    """Convert an integer geohash code to its base32 string"""
+    code = int(code)
+    return "".join(GEOHASH_BASE32[(code >> (5 * (precision - 1 - i))) & 31] for i in range(precision))
+
+def geohash_precision_for_zoom(zoom):
+    """Pick a geohash precision giving a few dozen cells across the viewport"""
+    return int(np.clip(int(zoom * 0.4) + 1, 1, GEOHASH_MAX_PRECISION))
+
+def hex_size_deg(zoom):
+    """Hexagon circumradius in degrees for a map zoom level"""
+    return HEX_SIZE_AT_ZOOM_0_KM / (2 ** zoom) / KM_PER_DEGREE
+
+def hex_bin(x, y, size, weights=None):
+    """Bin planar points into pointy-top hexagons; return axial (q, r) per cell and summed weights"""
+    q = (np.sqrt(3) / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+
+    # Cube rounding: fix the coordinate with the largest rounding error
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    # Pack (q, r) into one int64 so unique runs on a flat array instead of rows
+    keys = (rq.astype(np.int64) + HEX_AXIAL_OFFSET) * HEX_AXIAL_SPAN + (rr.astype(np.int64) + HEX_AXIAL_OFFSET)
+    cells, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse.ravel(), weights=weights, minlength=len(cells))
+    return cells // HEX_AXIAL_SPAN - HEX_AXIAL_OFFSET, cells % HEX_AXIAL_SPAN - HEX_AXIAL_OFFSET, counts
+
+def hex_centers(q, r, size):
+    """Planar centers of axial hex cells"""
+    return size * np.sqrt(3) * (q + r / 2), size * 1.5 * r
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_pyramid(lats, lons, grid):
+    """Bin points once at the finest level and derive every coarser level from the cells"""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    pyramid = {"grid": grid, "levels": {}, "points": len(lats)}
+
+    if grid == "Geohash":
+        # Coarser geohashes are prefixes, so shifting the finest codes re-bins without touching points
+        finest = geohash_encode(lats, lons, GEOHASH_MAX_PRECISION)
+        for precision in range(1, GEOHASH_MAX_PRECISION + 1):
+            codes, counts = np.unique(finest >> np.uint64(5 * (GEOHASH_MAX_PRECISION - precision)), return_counts=True)
+            pyramid["levels"][precision] = {"codes": codes, "counts": counts.astype(float)}
+        return pyramid
+
+    # Hex grid on a local equirectangular projection around the data's mean latitude.
+    # Hexagons don't nest, so every level bins the points themselves (still once per dataset).
+    lat0 = float(np.mean(lats)) if len(lats) else 0.0
+    x_scale = np.cos(np.radians(lat0))
+    pyramid["lat0"] = lat0
+    x, y = lons * x_scale, lats
+    for zoom in HEX_ZOOM_LEVELS:
+        q, r, counts = hex_bin(x, y, hex_size_deg(zoom))
+        pyramid["levels"][zoom] = {"q": q, "r": r, "counts": counts}
+    return pyramid
+
+def level_for_zoom(pyramid, zoom):
+    """Map a map zoom level onto a pyramid level"""
+    if pyramid["grid"] == "Geohash":
+        return geohash_precision_for_zoom(zoom)
+    return int(np.clip(zoom, min(HEX_ZOOM_LEVELS), max(HEX_ZOOM_LEVELS)))
+
+def cell_polygons(pyramid, level):
+    """Yield (polygon ring as [lat, lon] pairs, center, count, label) for each cell at a level"""
+    data = pyramid["levels"][level]
+    if pyramid["grid"] == "Geohash":
+        lat_min, lon_min, lat_size, lon_size = geohash_bounds(data["codes"], level)
+        for code, lat, lon, count in zip(data["codes"], lat_min, lon_min, data["counts"]):
+            ring = [[lat, lon], [lat, lon + lon_size], [lat + lat_size, lon + lon_size], [lat + lat_size, lon]]
+            yield ring, (lat + lat_size / 2, lon + lon_size / 2), count, geohash_to_string(code, level)
+        return
+
+    size = hex_size_deg(level)
+    x_scale = np.cos(np.radians(pyramid["lat0"]))
+    cx, cy = hex_centers(data["q"], data["r"], size)
+    angles = np.radians(np.arange(6) * 60 - 30)
+    for x, y, q, r, count in zip(cx, cy, data["q"], data["r"], data["counts"]):
+        ring = [[y + size * np.sin(a), (x + size * np.cos(a)) / x_scale] for a in angles]
+        yield ring, (y, x / x_scale), count, f"hex {q},{r}"
+
+def build_layer(pyramid, level, style):
+    """Render one pyramid level as a choropleth or a weighted heatmap"""
+    cells = list(cell_polygons(pyramid, level))
+    if style == "Heatmap":
+        return HeatMap([[center[0], center[1], float(count)] for _, center, count, _ in cells], radius=20), None
+
+    counts = [count for _, _, count, _ in cells]
+    colormap = cm.linear.YlOrRd_09.scale(min(counts), max(counts) if max(counts) > min(counts) else min(counts) + 1)
+    colormap.caption = "Points per cell"
+    features = {
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [[[lon, lat] for lat, lon in ring + ring[:1]]]},
+            "properties": {"cell": label, "count": int(count)}
+        } for ring, _, count, label in cells]
+    }
+    layer = folium.GeoJson(
+        features,
+        style_function=lambda feature: {
+            "fillColor": colormap(feature["properties"]["count"]),
+            "color": "#555555",
+            "weight": 0.5,
+            "fillOpacity": 0.6
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["cell", "count"], aliases=["Cell", "Points"])
+    )
+    return layer, colormap
+
+def show():
+    st.title("Density Heatmap")
+    st.write("Aggregate large point sets into geohash or hexagonal cells instead of individual markers")
+
+    sources = ["Upload CSV"]
+    if st.session_state.get("geocoded_locations"):
+        sources.append("Geocoded addresses")
+    if st.session_state.get("poi_results"):
+        sources.append("Points of interest")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        source = st.selectbox("Points source", sources)
+    with col2:
+        grid = st.selectbox("Grid", ["Hexagons", "Geohash"])
+    with col3:
+        style = st.selectbox("Style", ["Choropleth", "Heatmap"])
+
+    try:
+        points = None
+        if source == "Upload CSV":
+            points_file = st.file_uploader("Points CSV with latitude and longitude columns", type=["csv"])
+            if points_file:
+                points = pd.read_csv(points_file, usecols=["latitude", "longitude"])
+        elif source == "Geocoded addresses":
+            points = pd.DataFrame(st.session_state.geocoded_locations)
+        else:
+            points = pd.DataFrame(st.session_state.poi_results)
+
+        if points is not None:
+            points = points.dropna(subset=["latitude", "longitude"])
+        if points is None or points.empty:
+            st.info("Upload a CSV with 'latitude' and 'longitude' columns to begin")
+            return
+
+        with st.spinner(f"Binning {len(points):,} points..."):
+            pyramid = build_pyramid(
+                points["latitude"].to_numpy(dtype=float),
+                points["longitude"].to_numpy(dtype=float),
+                grid
+            )
+
+        # Follow the map's zoom; the pyramid already holds every level, so zooming never re-bins.
+        # The view remembers which points it was set up for and re-centres when they change.
+        data_key = (source, int(pd.util.hash_pandas_object(points[["latitude", "longitude"]], index=False).sum()))
+        if st.session_state.get("heatmap_view", {}).get("data") != data_key:
+            st.session_state.heatmap_view = {
+                "center": [float(points["latitude"].mean()), float(points["longitude"].mean())],
+                "zoom": 10,
+                "data": data_key
+            }
+        view = st.session_state.heatmap_view
+        level = level_for_zoom(pyramid, view["zoom"])
+        cell_count = len(pyramid["levels"][level]["counts"])
+
+        cols = st.columns(3)
+        cols[0].metric("Points", f"{pyramid['points']:,}")
+        cols[1].metric("Cells drawn", f"{cell_count:,}")
+        cols[2].metric("Level", f"precision {level}" if grid == "Geohash" else f"zoom {level}")
+
+        m = folium.Map(location=view["center"], zoom_start=view["zoom"])
+        layer, colormap = build_layer(pyramid, level, style)
+        layer.add_to(m)
+        if colormap is not None:
+            colormap.add_to(m)
+
+        with profiling.span("folium.render"):
+            output = st_folium(m, center=view["center"], zoom=view["zoom"], width=800, height=500,
+                               key="heatmap_map", returned_objects=["zoom", "center"])
+        if output and output.get("zoom") and output["zoom"] != view["zoom"]:
+            center = output.get("center") or {}
+            st.session_state.heatmap_view = {
+                "center": [center.get("lat", view["center"][0]), center.get("lng", view["center"][1])],
+                "zoom": output["zoom"],
+                "data": data_key
+            }
+            st.rerun()
+    except ValueError as e:
+        st.error(f"Invalid point data: {str(e)}")
+    except Exception as e:
+        st.error(f"Error building heatmap: {str(e)}")
@@ -4,6 +4,8 @@ import folium
 from streamlit_folium import folium_static
 import math
 import random
+from . import profiling
+from .route import NOMINATIM_DOMAIN, NOMINATIM_SCHEME
 
 def show():
     st.title("Points of Interest")
@@ -27,8 +29,9 @@ def show():
         if address:
             try:
                 # Geocode address
-                geolocator = Nominatim(user_agent="poi_finder")
-                location = geolocator.geocode(address)
+                geolocator = Nominatim(user_agent="poi_finder", domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME)
+                with profiling.span("nominatim.geocode"):
+                    location = geolocator.geocode(address)
                 
                 if location:
                     # Generate simulated POIs around the location
@@ -53,6 +56,7 @@ def show():
                     
                     # Sort by distance
                     pois.sort(key=lambda x: x['distance'])
+                    st.session_state.poi_results = pois
                     
                     st.success(f"Found {len(pois)} {poi_type}s within {radius} km")
                     
@@ -79,7 +83,8 @@ def show():
                                 fill=True,
                                 fill_opacity=0.2).add_to(m)
                     
-                    folium_static(m, width=700, height=500)
+                    with profiling.span("folium.render"):
+                        folium_static(m, width=700, height=500)
                     
                     # Display POI list
                     st.subheader(f"Nearby {poi_type.capitalize()}s")
@@ -0,0 +1,193 @@
+import streamlit as st
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Configuration
+MODES = ["Off", "Spans", "Spans + sampling", "Spans + cProfile"]
+ENV_MODES = {"1": "Spans", "spans": "Spans", "sample": "Spans + sampling", "cprofile": "Spans + cProfile"}
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+TOP_FUNCTIONS = 25
+
+# Each Streamlit session runs its script in its own thread, so the active recorder is per thread
+_local = threading.local()
+
+class Recorder:
+    """Collects nested span timings for one rerun"""
+
+    def __init__(self):
+        self.stack = []  # [name, time spent in child spans]
+        self.totals = {}  # span path -> [calls, total seconds, self seconds]
+
+    def record(self, path, elapsed, self_time):
+        entry = self.totals.setdefault(path, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += self_time
+
+    def breakdown(self):
+        """Per-span table with call counts, total/self time and share of the rerun"""
+        rerun_total = sum(total for path, (_, total, _) in self.totals.items() if len(path) == 1) or 1e-9
+        rows = [{
+            "Span": "· " * (len(path) - 1) + path[-1],
+            "Calls": calls,
+            "Total (ms)": round(total * 1000, 2),
+            "Self (ms)": round(self_time * 1000, 2),
+            "% of rerun": round(total / rerun_total * 100, 1)
+        } for path, (calls, total, self_time) in sorted(self.totals.items())]
+        return pd.DataFrame(rows)
+
+    def collapsed_stacks(self):
+        """Self time per span path in the collapsed-stack format used by flamegraph.pl and speedscope"""
+        return "\n".join(
+            f"{';'.join(path)} {int(self_time * 1_000_000)}"
+            for path, (_, _, self_time) in sorted(self.totals.items())
+        ) + "\n"
+
+class Sampler(threading.Thread):
+    """Periodically samples one thread's Python stack into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self.running = threading.Event()
+
+    def run(self):
+        self.running.set()
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.running.clear()
+        self.join()
+
+    def collapsed_stacks(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+@contextmanager
+def span(name):
+    """Time a block as a named span; a no-op unless profiling is on"""
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        yield
+        return
+
+    recorder.stack.append([name, 0.0])
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _, child_time = recorder.stack.pop()
+        path = tuple(frame[0] for frame in recorder.stack) + (name,)
+        recorder.record(path, elapsed, elapsed - child_time)
+        if recorder.stack:
+            recorder.stack[-1][1] += elapsed
+
+def profiled(name):
+    """Decorator timing every call of a function as a span"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "recorder", None) is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def sidebar_controls():
+    """Profiling mode picker for the sidebar, defaulting to the GEOAI_PROFILE environment variable"""
+    default = ENV_MODES.get(os.environ.get("GEOAI_PROFILE", "").lower(), "Off")
+    return st.selectbox("Profiling", MODES, index=MODES.index(default), key="profiling_mode",
+                        help="Time tab renders and key helpers; results appear at the bottom of the page")
+
+@contextmanager
+def rerun(mode):
+    """Profile one script rerun in the given mode and yield its results holder"""
+    if mode == "Off":
+        yield None
+        return
+
+    results = {"recorder": Recorder(), "sampler": None, "cprofile": None}
+    _local.recorder = results["recorder"]
+    if mode == "Spans + sampling":
+        results["sampler"] = Sampler(threading.get_ident())
+        results["sampler"].start()
+        results["sampler"].running.wait()
+    elif mode == "Spans + cProfile":
+        results["cprofile"] = cProfile.Profile()
+        try:
+            results["cprofile"].enable()
+        except ValueError:
+            # Only one profiler can be active per process; another session holds it
+            results["cprofile"] = None
+
+    try:
+        with span("rerun"):
+            yield results
+    finally:
+        if results["sampler"] is not None:
+            results["sampler"].stop()
+        if results["cprofile"] is not None:
+            results["cprofile"].disable()
+        _local.recorder = None
+
+def report(results):
+    """Render the per-rerun breakdown and flame-graph downloads"""
+    if results is None:
+        return
+
+    recorder = results["recorder"]
+    st.write("---")
+    with st.expander("⏱️ Profiling: last rerun", expanded=True):
+        st.dataframe(recorder.breakdown(), width="stretch", hide_index=True)
+        st.download_button(
+            label="🔥 Span flame graph (collapsed stacks)",
+            data=recorder.collapsed_stacks().encode("utf-8"),
+            file_name="spans.folded",
+            mime="text/plain"
+        )
+
+        if results["sampler"] is not None:
+            sampler = results["sampler"]
+            st.caption(f"{sum(sampler.samples.values())} stack samples every {sampler.interval*1000:.0f} ms")
+            st.download_button(
+                label="🔥 Sampled flame graph (collapsed stacks)",
+                data=sampler.collapsed_stacks().encode("utf-8"),
+                file_name="samples.folded",
+                mime="text/plain"
+            )
+
+        if results["cprofile"] is not None:
+            stream = io.StringIO()
+            pstats.Stats(results["cprofile"], stream=stream).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            st.code(stream.getvalue(), language="text")
+            st.download_button(
+                label="📄 cProfile stats (.prof)",
+                data=marshal.dumps(results["cprofile"].stats),  # the .prof format pstats and snakeviz load
+                file_name="rerun.prof",
+                mime="application/octet-stream"
+            )
+        elif "cProfile" in st.session_state.get("profiling_mode", ""):
+            st.warning("cProfile is busy in another session; only span timings were captured.")
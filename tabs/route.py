@@ -6,20 +6,31 @@ import polyline
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
 from geopy.distance import geodesic
+import os
 import time
 from datetime import timedelta
+from . import autocomplete, profiling, warm_cache
 
 # Configuration
-OSRM_URL = "http://router.project-osrm.org/route/v1"
+OSRM_URL = os.environ.get("OSRM_URL", "http://router.project-osrm.org/route/v1")
+NOMINATIM_DOMAIN = os.environ.get("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org")
+NOMINATIM_SCHEME = os.environ.get("NOMINATIM_SCHEME", "https")
 GEOCODING_TIMEOUT = 10
 
+@profiling.profiled("route.get_coordinates")
 def get_coordinates(address):
     """Enhanced global geocoding with retries"""
-    geolocator = Nominatim(user_agent="global_route_planner")
+    # Known addresses resolve locally without a rate-limited round trip
+    cached = autocomplete.resolve(address)
+    if cached:
+        return {"lat": cached["lat"], "lon": cached["lon"], "address": cached["address"]}
+    
+    geolocator = Nominatim(user_agent="global_route_planner", domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME)
     geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
     try:
         location = geocode(address, timeout=GEOCODING_TIMEOUT)
         if location:
+            autocomplete.record_geocode(address, location.address, location.latitude, location.longitude)
             return {
                 "lat": location.latitude,
                 "lon": location.longitude,
@@ -30,40 +41,87 @@ def get_coordinates(address):
         st.error(f"Geocoding error: {str(e)}")
         return None
 
-def get_route(start_lat, start_lon, end_lat, end_lon, mode):
-    """Get route with proper error handling and consistent data structure"""
+def format_instruction(step):
+    """Turn an OSRM step maneuver into a readable instruction"""
+    maneuver = step.get('maneuver', {})
+    kind = maneuver.get('type', '')
+    modifier = maneuver.get('modifier', '')
+    road = step.get('name') or 'the road'
+    
+    if kind == 'depart':
+        return f"Head {modifier} on {road}" if modifier else f"Start on {road}"
+    if kind == 'arrive':
+        return "Arrive at your destination"
+    if kind in ('roundabout', 'rotary') and maneuver.get('exit'):
+        return f"Take exit {maneuver['exit']} at the roundabout onto {road}"
+    
+    verbs = {'turn': 'Turn', 'end of road': 'Turn', 'fork': 'Keep', 'continue': 'Continue'}
+    verb = verbs.get(kind, kind.replace('_', ' ').capitalize() or 'Continue')
+    return f"{verb} {modifier} onto {road}" if modifier else f"{verb} onto {road}"
+
+def fetch_osrm_route(start_lat, start_lon, end_lat, end_lon, mode):
+    """Request a route from OSRM and return its first route object, or None"""
     profiles = {
         "driving": "car",
         "walking": "foot",
         "bicycling": "bike"
     }
     
-    try:
+    with profiling.span("osrm.request"):
         response = requests.get(
             f"{OSRM_URL}/{profiles[mode]}/{start_lon},{start_lat};{end_lon},{end_lat}",
-            params={'overview': 'full', 'steps': 'true'},
+            params={'overview': 'full', 'steps': 'true', 'annotations': 'distance,duration'},
             timeout=15
         )
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('code') == 'Ok' and data.get('routes'):
-                route = data['routes'][0]
-                return {
-                    "geometry": route['geometry'],  # Polyline encoded string
-                    "coordinates": polyline.decode(route['geometry']),  # Decoded coordinates
-                    "distance": route['distance'],  # in meters
-                    "duration": route['duration'],  # in seconds
-                    "start_address": st.session_state.start_point.get("address", "Start Location"),
-                    "end_address": st.session_state.end_point.get("address", "End Location"),
-                    "travel_mode": mode.capitalize(),
-                    "steps": data.get('waypoints', [{}])[0].get('steps', [])
-                }
+    if response.status_code == 200:
+        data = response.json()
+        if data.get('code') == 'Ok' and data.get('routes'):
+            return data['routes'][0]
+    return None
+
+@profiling.profiled("route.get_route")
+def get_route(start_lat, start_lon, end_lat, end_lon, mode):
+    """Get route with proper error handling and consistent data structure"""
+    try:
+        # Routes between known locations come from the warm-start bundle
+        route = warm_cache.lookup_route(start_lat, start_lon, end_lat, end_lon, mode)
+        if route is None:
+            route = fetch_osrm_route(start_lat, start_lon, end_lat, end_lon, mode)
+        if route:
+            legs = route.get('legs', [])
+            steps = [step for leg in legs for step in leg.get('steps', [])]
+            for step in steps:
+                step['instruction'] = format_instruction(step)
+            with profiling.span("polyline.decode"):
+                coordinates = polyline.decode(route['geometry'])
+            return {
+                "geometry": route['geometry'],  # Polyline encoded string
+                "coordinates": coordinates,  # Decoded coordinates
+                "distance": route['distance'],  # in meters
+                "duration": route['duration'],  # in seconds
+                "start_address": st.session_state.start_point.get("address", "Start Location"),
+                "end_address": st.session_state.end_point.get("address", "End Location"),
+                "travel_mode": mode.capitalize(),
+                "steps": steps,
+                # Per-segment values between consecutive geometry coordinates
+                "segment_distances": [d for leg in legs for d in leg.get('annotation', {}).get('distance', [])],
+                "segment_durations": [d for leg in legs for d in leg.get('annotation', {}).get('duration', [])]
+            }
         st.error("Failed to get route from OSRM service")
         return None
     except Exception as e:
         st.error(f"Routing error: {str(e)}")
         return None
 
+def use_suggestion(point_key, suggestion):
+    """Set a route endpoint from an autocomplete suggestion without geocoding"""
+    st.session_state[point_key] = {
+        "lat": suggestion["lat"],
+        "lon": suggestion["lon"],
+        "address": suggestion["address"]
+    }
+    st.session_state.route_data = None  # Clear previous route
+
 def format_duration(seconds):
     """Human-readable duration"""
     td = timedelta(seconds=seconds)
@@ -91,6 +149,8 @@ def show():
     col1, col2 = st.columns(2)
     with col1:
         start_address = st.text_input("Start Address", key="start_addr", value="mughalpura, Lahore, Pakistan")
+        autocomplete.suggestion_box(start_address, key="start_suggestion",
+                                    on_pick=lambda s: use_suggestion("start_point", s))
         if st.button("Set Start Location"):
             if start_address:
                 with st.spinner("Locating start point..."):
@@ -104,6 +164,8 @@ def show():
     
     with col2:
         end_address = st.text_input("End Address", key="end_addr", value="Garden Town, Lahore, Pakistan")
+        autocomplete.suggestion_box(end_address, key="end_suggestion",
+                                    on_pick=lambda s: use_suggestion("end_point", s))
         if st.button("Set End Location"):
             if end_address:
                 with st.spinner("Locating end point..."):
@@ -131,33 +193,35 @@ def show():
             ).km
             zoom = 12 if distance_km < 500 else 6
         
-        m = folium.Map(location=map_center, zoom_start=zoom)
-        
-        if st.session_state.start_point:
-            folium.Marker(
-                [st.session_state.start_point["lat"], st.session_state.start_point["lon"]],
-                popup="Start: " + st.session_state.start_point.get("address", ""),
-                icon=folium.Icon(color="green")
-            ).add_to(m)
-        
-        if st.session_state.end_point:
-            folium.Marker(
-                [st.session_state.end_point["lat"], st.session_state.end_point["lon"]],
-                popup="End: " + st.session_state.end_point.get("address", ""),
-                icon=folium.Icon(color="red")
-            ).add_to(m)
-        
-        # Draw route if available
-        if st.session_state.route_data and 'coordinates' in st.session_state.route_data:
-            folium.PolyLine(
-                st.session_state.route_data["coordinates"],
-                color="blue",
-                weight=5,
-                opacity=0.7,
-                tooltip=f"{st.session_state.route_data['distance']/1000:.1f} km"
-            ).add_to(m)
+        with profiling.span("folium.build_map"):
+            m = folium.Map(location=map_center, zoom_start=zoom)
+            
+            if st.session_state.start_point:
+                folium.Marker(
+                    [st.session_state.start_point["lat"], st.session_state.start_point["lon"]],
+                    popup="Start: " + st.session_state.start_point.get("address", ""),
+                    icon=folium.Icon(color="green")
+                ).add_to(m)
+            
+            if st.session_state.end_point:
+                folium.Marker(
+                    [st.session_state.end_point["lat"], st.session_state.end_point["lon"]],
+                    popup="End: " + st.session_state.end_point.get("address", ""),
+                    icon=folium.Icon(color="red")
+                ).add_to(m)
+            
+            # Draw route if available
+            if st.session_state.route_data and 'coordinates' in st.session_state.route_data:
+                folium.PolyLine(
+                    st.session_state.route_data["coordinates"],
+                    color="blue",
+                    weight=5,
+                    opacity=0.7,
+                    tooltip=f"{st.session_state.route_data['distance']/1000:.1f} km"
+                ).add_to(m)
         
-        st_folium(m, width=800, height=500)
+        with profiling.span("folium.render"):
+            st_folium(m, width=800, height=500)
     
     # Route calculation
     if st.session_state.start_point and st.session_state.end_point:
@@ -0,0 +1,206 @@
+import streamlit as st
+import folium
+from streamlit_folium import folium_static
+import numpy as np
+import pandas as pd
+import polyline
+from . import profiling
+
+# Configuration
+EARTH_RADIUS_M = 6371000.0
+MAX_PAIRS_PER_CHUNK = 4_000_000  # query points x route segments evaluated per vectorized pass
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Vectorized haversine distance in meters"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_profile(geometry, segment_distances, segment_durations, total_distance, total_duration):
+    """Precompute cumulative distance/time arrays along a route geometry (once per route)"""
+    coords = np.array(polyline.decode(geometry), dtype=float)
+    lats, lons = coords[:, 0], coords[:, 1]
+    n_segments = len(coords) - 1
+
+    # Prefer OSRM annotations; fall back to geometry lengths spread over the total duration
+    if len(segment_distances) == n_segments:
+        seg_dist = np.asarray(segment_distances, dtype=float)
+    else:
+        seg_dist = haversine_m(lats[:-1], lons[:-1], lats[1:], lons[1:])
+        if seg_dist.sum() > 0 and total_distance:
+            seg_dist *= total_distance / seg_dist.sum()
+    if len(segment_durations) == n_segments:
+        seg_time = np.asarray(segment_durations, dtype=float)
+    else:
+        seg_time = seg_dist * (total_duration / seg_dist.sum()) if seg_dist.sum() > 0 else np.zeros(n_segments)
+
+    return {
+        "lats": lats,
+        "lons": lons,
+        "seg_dist": seg_dist,
+        "seg_time": seg_time,
+        "cum_dist": np.concatenate([[0.0], np.cumsum(seg_dist)]),
+        "cum_time": np.concatenate([[0.0], np.cumsum(seg_time)])
+    }
+
+def profile_for(route_data):
+    """Profile of the route in session, built from its geometry and annotations"""
+    return build_profile(
+        route_data["geometry"],
+        tuple(route_data.get("segment_distances") or ()),
+        tuple(route_data.get("segment_durations") or ()),
+        route_data.get("distance", 0.0),
+        route_data.get("duration", 0.0)
+    )
+
+def position_at(profile, values, by="time"):
+    """Interpolate position(s) at given elapsed seconds or meters by binary search"""
+    cum = profile["cum_time"] if by == "time" else profile["cum_dist"]
+    other = profile["cum_dist"] if by == "time" else profile["cum_time"]
+    values = np.clip(np.atleast_1d(np.asarray(values, dtype=float)), 0.0, cum[-1])
+
+    idx = np.clip(np.searchsorted(cum, values, side="right") - 1, 0, len(cum) - 2)
+    span = cum[idx + 1] - cum[idx]
+    t = np.divide(values - cum[idx], span, out=np.zeros_like(values), where=span > 0)
+
+    return {
+        "lat": profile["lats"][idx] + t * (profile["lats"][idx + 1] - profile["lats"][idx]),
+        "lon": profile["lons"][idx] + t * (profile["lons"][idx + 1] - profile["lons"][idx]),
+        "distance" if by == "time" else "time": other[idx] + t * (other[idx + 1] - other[idx])
+    }
+
+def nearest_on_route(profile, lats, lons):
+    """Vectorized distance-to-route and ETA at the nearest route point for many query points"""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    # Local equirectangular projection in meters around the route
+    lat0 = np.radians(profile["lats"].mean())
+    scale_x = np.cos(lat0) * np.pi / 180 * EARTH_RADIUS_M
+    scale_y = np.pi / 180 * EARTH_RADIUS_M
+    ax, ay = profile["lons"][:-1] * scale_x, profile["lats"][:-1] * scale_y
+    dx, dy = profile["lons"][1:] * scale_x - ax, profile["lats"][1:] * scale_y - ay
+    seg_len2 = dx * dx + dy * dy
+    seg_len2[seg_len2 == 0] = 1e-12
+
+    px, py = lons * scale_x, lats * scale_y
+    n_segments = len(ax)
+    chunk = max(1, MAX_PAIRS_PER_CHUNK // n_segments)
+
+    distance = np.empty(len(lats))
+    along = np.empty(len(lats))
+    eta = np.empty(len(lats))
+    for start in range(0, len(lats), chunk):
+        qx = px[start:start + chunk, None]
+        qy = py[start:start + chunk, None]
+        t = np.clip(((qx - ax) * dx + (qy - ay) * dy) / seg_len2, 0.0, 1.0)
+        d2 = (ax + t * dx - qx) ** 2 + (ay + t * dy - qy) ** 2
+        best = np.argmin(d2, axis=1)
+        rows = np.arange(len(best))
+        best_t = t[rows, best]
+
+        distance[start:start + chunk] = np.sqrt(d2[rows, best])
+        along[start:start + chunk] = profile["cum_dist"][best] + best_t * profile["seg_dist"][best]
+        eta[start:start + chunk] = profile["cum_time"][best] + best_t * profile["seg_time"][best]
+
+    return {"distance_to_route": distance, "distance_along": along, "eta": eta}
+
+def step_profile(route_data):
+    """Cumulative distance and time at the end of each turn-by-turn step"""
+    rows = []
+    cum_dist = cum_time = 0.0
+    for i, step in enumerate(route_data.get("steps") or [], 1):
+        cum_dist += step.get("distance", 0.0)
+        cum_time += step.get("duration", 0.0)
+        rows.append({
+            "Step": i,
+            "Instruction": step.get("instruction") or step.get("name", ""),
+            "Distance (m)": round(step.get("distance", 0.0), 1),
+            "Time (s)": round(step.get("duration", 0.0), 1),
+            "Cumulative (km)": round(cum_dist / 1000, 2),
+            "Cumulative (min)": round(cum_time / 60, 1)
+        })
+    return pd.DataFrame(rows)
+
+def show():
+    st.title("Route Analysis")
+    st.write("Per-segment distance and time profiles, positions along the route and ETAs for many points")
+
+    route_data = st.session_state.get("route_data")
+    if not route_data or not route_data.get("geometry"):
+        st.warning("No route data available. Please plan a route first using the Route Planner tab.")
+        return
+
+    try:
+        with profiling.span("route_analysis.build_profile"):
+            profile = profile_for(route_data)
+    except Exception as e:
+        st.error(f"Error processing route data: {str(e)}")
+        return
+
+    if len(profile["lats"]) < 2:
+        st.error("Invalid route geometry - not enough points to analyse")
+        return
+
+    # Step profile
+    st.subheader("📊 Step Profile")
+    steps = step_profile(route_data)
+    if steps.empty:
+        st.info("This route has no turn-by-turn steps; recalculate it to get them.")
+    else:
+        st.dataframe(steps, width="stretch", hide_index=True)
+    st.line_chart(pd.DataFrame({
+        "Distance (km)": profile["cum_dist"] / 1000,
+        "Elapsed (min)": profile["cum_time"] / 60
+    }).set_index("Elapsed (min)"))
+
+    # Position along the route
+    st.subheader("📍 Position Along Route")
+    total_minutes = float(profile["cum_time"][-1] / 60)
+    minutes = st.slider("Elapsed time (minutes)", 0.0, max(total_minutes, 0.1), min(total_minutes / 2, total_minutes))
+    position = position_at(profile, minutes * 60, by="time")
+    lat, lon, covered = position["lat"][0], position["lon"][0], position["distance"][0]
+    st.write(f"After **{minutes:.1f} min** you are at **{lat:.6f}, {lon:.6f}**, "
+             f"{covered/1000:.2f} km along the route")
+
+    m = folium.Map(location=[lat, lon], zoom_start=13)
+    folium.PolyLine(list(zip(profile["lats"], profile["lons"])), color="#1E90FF", weight=5, opacity=0.7).add_to(m)
+    folium.Marker([lat, lon], tooltip=f"{minutes:.1f} min", icon=folium.Icon(color="orange")).add_to(m)
+
+    # Bulk point-to-route queries
+    st.subheader("⏱️ ETA for Many Points")
+    points_file = st.file_uploader("Points CSV with latitude and longitude columns", type=["csv"])
+    if points_file:
+        try:
+            points = pd.read_csv(points_file)
+            if not {"latitude", "longitude"}.issubset(points.columns):
+                st.error("Points must have 'latitude' and 'longitude' columns")
+            else:
+                with st.spinner(f"Projecting {len(points):,} points onto the route..."), \
+                        profiling.span("route_analysis.nearest_on_route"):
+                    result = nearest_on_route(
+                        profile,
+                        points["latitude"].to_numpy(dtype=float),
+                        points["longitude"].to_numpy(dtype=float)
+                    )
+                points = points.assign(
+                    distance_to_route_m=result["distance_to_route"].round(1),
+                    distance_along_km=(result["distance_along"] / 1000).round(3),
+                    eta_min=(result["eta"] / 60).round(1)
+                )
+                st.dataframe(points.head(1000), width="stretch")
+                st.download_button(
+                    label="⬇️ Download ETAs",
+                    data=points.to_csv(index=False).encode("utf-8"),
+                    file_name="route_etas.csv",
+                    mime="text/csv"
+                )
+                for _, row in points.head(200).iterrows():
+                    folium.CircleMarker([row["latitude"], row["longitude"]], radius=4, color="red",
+                                        tooltip=f"ETA {row['eta_min']} min").add_to(m)
+        except Exception as e:
+            st.error(f"Error processing points: {str(e)}")
+
+    with profiling.span("folium.render"):
+        folium_static(m, width=800, height=500)
@@ -5,6 +5,7 @@ import polyline
 from datetime import datetime
 from branca.element import Element, MacroElement
 from jinja2 import Template
+from . import profiling
 
 class TitleElement(MacroElement):
     def __init__(self, title_text):
@@ -61,7 +62,8 @@ def show():
     
     try:
         # Decode the polyline route geometry
-        route_points = polyline.decode(route_data['geometry'])
+        with profiling.span("polyline.decode"):
+            route_points = polyline.decode(route_data['geometry'])
         
         if not route_points or len(route_points) < 2:
             st.error("Invalid route geometry - not enough points to draw")
@@ -78,39 +80,41 @@ def show():
         center_lon = sum(lons) / len(lons)
         
         # Create the map
-        m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
-        
-        # Add the route line
-        folium.PolyLine(
-            route_points,
-            color='#1E90FF',  # DodgerBlue
-            weight=6,
-            opacity=0.8,
-            tooltip=f"{route_data['distance']/1000:.1f} km, {format_duration(route_data['duration'])}"
-        ).add_to(m)
-        
-        # Add markers with custom icons
-        folium.Marker(
-            route_points[0],
-            popup=f"<b>Start</b><br>{route_data['start_address']}",
-            tooltip="Start",
-            icon=folium.Icon(color='green', icon='play', prefix='fa')
-        ).add_to(m)
-        
-        folium.Marker(
-            route_points[-1],
-            popup=f"<b>End</b><br>{route_data['end_address']}",
-            tooltip="End",
-            icon=folium.Icon(color='red', icon='flag-checkered', prefix='fa')
-        ).add_to(m)
-        
-        # Add title if specified
-        if map_title:
-            title_element = TitleElement(map_title)
-            m.get_root().add_child(title_element)
+        with profiling.span("folium.build_map"):
+            m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
+            
+            # Add the route line
+            folium.PolyLine(
+                route_points,
+                color='#1E90FF',  # DodgerBlue
+                weight=6,
+                opacity=0.8,
+                tooltip=f"{route_data['distance']/1000:.1f} km, {format_duration(route_data['duration'])}"
+            ).add_to(m)
+            
+            # Add markers with custom icons
+            folium.Marker(
+                route_points[0],
+                popup=f"<b>Start</b><br>{route_data['start_address']}",
+                tooltip="Start",
+                icon=folium.Icon(color='green', icon='play', prefix='fa')
+            ).add_to(m)
+            
+            folium.Marker(
+                route_points[-1],
+                popup=f"<b>End</b><br>{route_data['end_address']}",
+                tooltip="End",
+                icon=folium.Icon(color='red', icon='flag-checkered', prefix='fa')
+            ).add_to(m)
+            
+            # Add title if specified
+            if map_title:
+                title_element = TitleElement(map_title)
+                m.get_root().add_child(title_element)
         
         # Display the map
-        folium_static(m, width=800, height=600)
+        with profiling.span("folium.render"):
+            folium_static(m, width=800, height=600)
         
         # Add download button
         if st.button("💾 Save Map as HTML"):
@@ -0,0 +1,272 @@
+"""Warm-start cache bundles for known locations.
+
+A bundle holds geocodes for a seed list of depots, cities and landmarks plus
+depot-to-depot route matrices and encoded geometries in one memory-mapped
+file, so those lookups are served locally from the first request.
+
+Build one offline from a CSV with an `address` column (optional `latitude`,
+`longitude` to skip geocoding and `depot` to limit the route matrix):
+
+    python -m tabs.warm_cache seeds.csv -o data/warm_cache.bin --modes driving walking
+"""
+import streamlit as st
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Configuration
+BUNDLE_PATH = os.environ.get("WARM_CACHE_PATH", os.path.join("data", "warm_cache.bin"))
+MAGIC = b"GEOAIWC1"
+VERSION = 1
+COORD_TOLERANCE = 1e-6  # degrees; matches coordinates that came out of the bundle
+LOCATION_DTYPE = np.dtype([
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("query_offset", "<u8"),
+    ("query_length", "<u8"),
+    ("address_offset", "<u8"),
+    ("address_length", "<u8")
+])
+
+def _align(offset, boundary=8):
+    return (offset + boundary - 1) // boundary * boundary
+
+class WarmCacheBundle:
+    """Read-only view over a memory-mapped bundle; arrays are numpy views, not copies"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a warm-start bundle")
+        (header_length,) = struct.unpack_from("<I", self.buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(bytes(self.buffer[start:start + header_length]))
+        if self.header.get("version") != VERSION:
+            raise ValueError(f"Unsupported bundle version {self.header.get('version')}")
+
+        self.modes = self.header["modes"]
+        n = self.header["locations"]
+        shape = (len(self.modes), n, n)
+        self.locations = self._section("locations", LOCATION_DTYPE)
+        self.distance = self._section("distance", "<f8").reshape(shape)
+        self.duration = self._section("duration", "<f8").reshape(shape)
+        self.geometry_index = self._section("geometry_index", "<u8").reshape(shape + (2,))
+        self.legs_index = self._section("legs_index", "<u8").reshape(shape + (2,))
+        self.strings_offset = self.header["sections"]["strings"][0]
+
+    def _section(self, name, dtype):
+        offset, length = self.header["sections"][name]
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.buffer, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+    def _bytes(self, offset, length):
+        start = self.strings_offset + int(offset)
+        return self.buffer[start:start + int(length)]
+
+    def geocodes(self):
+        """Yield (query, address, lat, lon) for every seeded location"""
+        for loc in self.locations:
+            yield (
+                self._bytes(loc["query_offset"], loc["query_length"]).decode("utf-8"),
+                self._bytes(loc["address_offset"], loc["address_length"]).decode("utf-8"),
+                float(loc["lat"]),
+                float(loc["lon"])
+            )
+
+    def find_location(self, lat, lon):
+        """Index of the seeded location at these coordinates, or None"""
+        matches = np.flatnonzero(
+            (np.abs(self.locations["lat"] - lat) < COORD_TOLERANCE) &
+            (np.abs(self.locations["lon"] - lon) < COORD_TOLERANCE)
+        )
+        return int(matches[0]) if len(matches) else None
+
+    def route(self, start_lat, start_lon, end_lat, end_lon, mode):
+        """OSRM-shaped route object between two seeded locations, or None"""
+        if mode not in self.modes:
+            return None
+        origin = self.find_location(start_lat, start_lon)
+        destination = self.find_location(end_lat, end_lon)
+        if origin is None or destination is None:
+            return None
+
+        m = self.modes.index(mode)
+        distance = self.distance[m, origin, destination]
+        if np.isnan(distance):
+            return None
+        geometry_offset, geometry_length = self.geometry_index[m, origin, destination]
+        legs_offset, legs_length = self.legs_index[m, origin, destination]
+        return {
+            "geometry": self._bytes(geometry_offset, geometry_length).decode("ascii"),
+            "distance": float(distance),
+            "duration": float(self.duration[m, origin, destination]),
+            "legs": json.loads(zlib.decompress(self._bytes(legs_offset, legs_length))) if legs_length else []
+        }
+
+def write_bundle(path, locations, routes, modes):
+    """Write a bundle from [(query, address, lat, lon)] and {(mode, i, j): OSRM route object}"""
+    n = len(locations)
+    shape = (len(modes), n, n)
+    strings = bytearray()
+
+    def add_bytes(data):
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    location_table = np.zeros(n, dtype=LOCATION_DTYPE)
+    for i, (query, address, lat, lon) in enumerate(locations):
+        query_offset, query_length = add_bytes(query.encode("utf-8"))
+        address_offset, address_length = add_bytes(address.encode("utf-8"))
+        location_table[i] = (lat, lon, query_offset, query_length, address_offset, address_length)
+
+    distance = np.full(shape, np.nan)
+    duration = np.full(shape, np.nan)
+    geometry_index = np.zeros(shape + (2,), dtype="<u8")
+    legs_index = np.zeros(shape + (2,), dtype="<u8")
+    for (mode, i, j), route in routes.items():
+        m = modes.index(mode)
+        distance[m, i, j] = route["distance"]
+        duration[m, i, j] = route["duration"]
+        geometry_index[m, i, j] = add_bytes(route["geometry"].encode("ascii"))
+        legs = json.dumps(route.get("legs", []), separators=(",", ":")).encode("utf-8")
+        legs_index[m, i, j] = add_bytes(zlib.compress(legs, 9))
+
+    sections = [
+        ("locations", location_table.tobytes()),
+        ("distance", distance.astype("<f8").tobytes()),
+        ("duration", duration.astype("<f8").tobytes()),
+        ("geometry_index", geometry_index.tobytes()),
+        ("legs_index", legs_index.tobytes()),
+        ("strings", bytes(strings))
+    ]
+
+    # The header records absolute offsets, which depend on its own length; repeat until stable
+    header = {
+        "version": VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "modes": list(modes),
+        "locations": n,
+        "sections": {name: [0, len(data)] for name, data in sections}
+    }
+    header_bytes = b""
+    while True:
+        offset = _align(len(MAGIC) + 4 + len(header_bytes))
+        for name, data in sections:
+            header["sections"][name] = [offset, len(data)]
+            offset = _align(offset + len(data))
+        encoded = json.dumps(header).encode("utf-8")
+        if len(encoded) == len(header_bytes):
+            header_bytes = encoded
+            break
+        header_bytes = encoded
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections:
+            f.seek(header["sections"][name][0])
+            f.write(data)
+
+def build_bundle(seeds_path, output_path, modes, delay=1.0):
+    """Geocode a seed list and route between its depots, then write the bundle"""
+    import requests
+    from geopy.geocoders import Nominatim
+    from geopy.extra.rate_limiter import RateLimiter
+    from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+    from .route import NOMINATIM_DOMAIN, NOMINATIM_SCHEME, GEOCODING_TIMEOUT, fetch_osrm_route
+
+    with open(seeds_path, newline="", encoding="utf-8") as f:
+        seeds = list(csv.DictReader(f))
+
+    geolocator = Nominatim(user_agent="geoai_warm_cache", domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME)
+    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=delay)
+
+    locations = []
+    depots = []
+    for seed in seeds:
+        query = seed["address"].strip()
+        if seed.get("latitude") and seed.get("longitude"):
+            address, lat, lon = query, float(seed["latitude"]), float(seed["longitude"])
+        else:
+            # One transient upstream failure shouldn't cost the rest of a long, rate-limited build
+            try:
+                location = geocode(query, timeout=GEOCODING_TIMEOUT)
+            except (GeocoderTimedOut, GeocoderServiceError) as e:
+                print(f"  skipped (geocoding error: {str(e)}): {query}")
+                continue
+            if not location:
+                print(f"  skipped (not found): {query}")
+                continue
+            address, lat, lon = location.address, location.latitude, location.longitude
+        if str(seed.get("depot", "1")).strip().lower() in ("1", "true", "yes", "y"):
+            depots.append(len(locations))
+        locations.append((query, address, lat, lon))
+        print(f"  geocoded: {query} -> {lat:.6f}, {lon:.6f}")
+
+    routes = {}
+    for mode in modes:
+        for i in depots:
+            for j in depots:
+                if i == j:
+                    continue
+                _, _, start_lat, start_lon = locations[i]
+                _, _, end_lat, end_lon = locations[j]
+                try:
+                    route = fetch_osrm_route(start_lat, start_lon, end_lat, end_lon, mode)
+                except (requests.RequestException, ValueError) as e:
+                    print(f"  skipped ({mode} routing error: {str(e)}): {locations[i][0]} -> {locations[j][0]}")
+                else:
+                    if route:
+                        routes[(mode, i, j)] = route
+                    else:
+                        print(f"  no {mode} route: {locations[i][0]} -> {locations[j][0]}")
+                time.sleep(delay)
+
+    write_bundle(output_path, locations, routes, modes)
+    print(f"Wrote {output_path}: {len(locations)} locations, {len(routes)} routes, "
+          f"{os.path.getsize(output_path)/1024:.1f} KB")
+
+@st.cache_resource(show_spinner=False)
+def get_bundle():
+    """Map the bundle once per process; None when no bundle is deployed"""
+    if not os.path.exists(BUNDLE_PATH):
+        return None
+    try:
+        return WarmCacheBundle(BUNDLE_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        st.warning(f"Could not load warm-start bundle {BUNDLE_PATH}: {str(e)}")
+        return None
+
+def lookup_route(start_lat, start_lon, end_lat, end_lon, mode):
+    """Route between two bundled locations, or None to fall back to OSRM"""
+    bundle = get_bundle()
+    if bundle is None:
+        return None
+    return bundle.route(start_lat, start_lon, end_lat, end_lon, mode)
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute a warm-start cache bundle from a seed list")
+    parser.add_argument("seeds", help="CSV with an 'address' column and optional latitude, longitude, depot")
+    parser.add_argument("-o", "--output", default=BUNDLE_PATH, help="Bundle file to write")
+    parser.add_argument("--modes", nargs="+", default=["driving"], choices=["driving", "walking", "bicycling"])
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between upstream requests")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    build_bundle(args.seeds, args.output, args.modes, args.delay)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from tabs.autocomplete import PrefixIndex, normalize
+
+def test_normalize_collapses_punctuation_and_case():
+    assert normalize("  Mughal Pura,  LAHORE ") == "mughal pura lahore"
+
+def test_popular_entry_beats_alphabetically_earlier_matches():
+    index = PrefixIndex()
+    for i in range(5000):
+        index.add(f"Lahore Street {i:05d}", f"Lahore Street {i:05d}", 31.5, 74.3)
+    index.add("Lahore Zoo", "Lahore Zoo", 31.55, 74.33, popularity=1000)
+
+    suggestions = index.suggest("lahore", limit=3)
+    assert suggestions[0]["address"] == "Lahore Zoo"
+    assert [s["address"] for s in suggestions[1:]] == ["Lahore Street 00000", "Lahore Street 00001"]
+
+def test_keys_sharing_an_entry_yield_distinct_suggestions():
+    index = PrefixIndex()
+    index.add("Data Darbar, Lahore", "Data Darbar, Lahore", 31.58, 74.31, popularity=50)
+    for alias in ["data darbar", "data darbar shrine", "data darbar mosque"]:
+        index.add(alias, "Data Darbar, Lahore", 31.58, 74.31, popularity=0)
+    index.add("Data Centre Road", "Data Centre Road", 31.4, 74.2)
+
+    suggestions = index.suggest("data", limit=2)
+    assert [s["address"] for s in suggestions] == ["Data Darbar, Lahore", "Data Centre Road"]
+
+def test_same_name_at_other_coordinates_is_a_separate_ambiguous_entry():
+    index = PrefixIndex()
+    index.add("Springfield", "Springfield", 39.8, -89.6)
+    index.add("Springfield", "Springfield", 42.1, -72.5, popularity=3)
+    index.add("Springfield", "Springfield", 39.8, -89.6)  # same place again only adds popularity
+
+    suggestions = index.suggest("spring")
+    assert [(s["lat"], s["lon"], s["popularity"]) for s in suggestions] == [(42.1, -72.5, 3), (39.8, -89.6, 2)]
+    # Ambiguous names don't resolve locally, so callers fall back to the geocoder
+    assert index.lookup("springfield") is None
+
+    index.add("Springfield, MA", "Springfield", 42.1, -72.5, popularity=0)
+    assert index.lookup("springfield ma")["lat"] == 42.1
+
+def test_short_prefixes_and_misses_return_nothing():
+    index = PrefixIndex()
+    index.add("Lahore Fort", "Lahore Fort", 31.59, 74.31)
+    assert index.suggest("la") == []
+    assert index.suggest("karachi") == []
+
+def test_bump_and_lookup_reorder_suggestions():
+    index = PrefixIndex()
+    index.add("Model Town", "Model Town", 31.48, 74.32)
+    index.add("Model Colony", "Model Colony", 24.9, 67.2)
+    assert index.suggest("model")[0]["address"] == "Model Colony"
+
+    index.bump("Model Town", 31.48, 74.32, amount=2)
+    assert index.lookup("MODEL TOWN")["popularity"] == 3
+    assert index.suggest("model")[0]["address"] == "Model Town"
+
+def test_adds_after_a_query_are_found():
+    index = PrefixIndex()
+    index.add("Gulberg", "Gulberg", 31.5, 74.35)
+    assert [s["address"] for s in index.suggest("gul")] == ["Gulberg"]
+    index.add("Gulshan", "Gulshan", 24.9, 67.1, popularity=5)
+    assert [s["address"] for s in index.suggest("gul")] == ["Gulshan", "Gulberg"]
+    assert index.lookup("gulshan")["lat"] == 24.9
+
+def test_popularity_storage_grows_past_initial_capacity():
+    index = PrefixIndex()
+    count = len(index.popularity) + 10
+    for i in range(count):
+        index.add(f"place {i}", f"place {i}", 0.0, 0.0, popularity=i)
+    assert index.suggest("place", limit=1)[0]["address"] == f"place {count - 1}"
@@ -0,0 +1,89 @@
+import io
+import json
+import struct
+
+import pyarrow.parquet as pq
+import pytest
+
+from tabs import export
+
+FIELDS = [("kind", "string"), ("name", "string"), ("index", "int64"), ("distance", "double")]
+
+def point(lon, lat, **properties):
+    return ("Point", (lon, lat), properties)
+
+def read(records, fields=FIELDS, chunk_size=3):
+    buffer = io.BytesIO()
+    count = export.write_geoparquet(iter(records), buffer, fields, chunk_size=chunk_size)
+    buffer.seek(0)
+    return count, pq.ParquetFile(buffer)
+
+def test_wkb_point_and_linestring():
+    assert export._to_wkb("Point", (74.3, 31.5)) == struct.pack("<BIdd", 1, 1, 74.3, 31.5)
+    wkb = export._to_wkb("LineString", [(1.0, 2.0), (3.0, 4.0)])
+    assert struct.unpack("<BII4d", wkb) == (1, 2, 2, 1.0, 2.0, 3.0, 4.0)
+
+def test_geoparquet_schema_is_stable_across_chunks():
+    records = [point(1.0, 2.0, kind="poi", name=None, index=i, distance=i) for i in range(3)]
+    records += [point(1.0, 2.0, kind="poi", name="late", index=3, distance=0.5)]
+    records += [point(1.0, 2.0, kind="poi")]  # keys missing entirely become nulls
+
+    count, parquet = read(records)
+    assert count == 5
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column("name").to_pylist() == [None, None, None, "late", None]
+    assert table.column("index").to_pylist() == [0, 1, 2, 3, None]
+    assert table.column("distance").to_pylist() == [0.0, 1.0, 2.0, 0.5, None]
+
+def test_geoparquet_stringifies_non_string_values():
+    _, parquet = read([point(0.0, 0.0, kind="poi", name=42)])
+    assert parquet.read().column("name").to_pylist() == ["42"]
+
+def test_geoparquet_rejects_unknown_properties():
+    records = [point(0.0, 0.0, kind="poi")] * 3 + [point(0.0, 0.0, kind="poi", surprise=1)]
+    with pytest.raises(ValueError, match="surprise"):
+        read(records)
+
+def test_geoparquet_metadata_defaults_to_crs84():
+    _, parquet = read([point(0.0, 0.0, kind="poi")])
+    geo = json.loads(parquet.schema_arrow.metadata[b"geo"])
+    assert geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
+    assert "crs" not in geo["columns"]["geometry"]
+
+def test_route_records_fit_route_schema():
+    route_data = {
+        "coordinates": [(31.5, 74.3), (31.6, 74.4)],
+        "start_address": "A",
+        "end_address": "B",
+        "travel_mode": "driving",
+        "distance": 1000.0,
+        "duration": 120.0,
+        "steps": [{"name": "Main St", "distance": 1000.0, "duration": 120.0,
+                   "maneuver": {"location": [74.3, 31.5]}}]
+    }
+    _, parquet = read(export.iter_route_records(route_data), export.DATASET_FIELDS["Route"], chunk_size=1)
+    table = parquet.read()
+    assert table.column("kind").to_pylist() == ["route", "step"]
+    assert table.column("index").to_pylist() == [None, 1]
+
+def test_export_bytes_encodes_utf8():
+    records = [point(74.3, 31.5, kind="geocode", address="Lāhore, پاکستان")]
+    data, count = export.export_bytes(iter(records), "GeoJSON", export.DATASET_FIELDS["Geocoded Addresses"])
+    assert count == 1
+    assert json.loads(data.decode("utf-8"))["features"][0]["properties"]["address"] == "Lāhore, پاکستان"
+
+    data, _ = export.export_bytes(iter(records * 2), "Newline-delimited GeoJSON", [])
+    assert data.count(b"\n") == 2 and b"\r" not in data
+
+def test_geojson_and_ndjson_streams():
+    records = [point(1.0, 2.0, kind="poi"), point(3.0, 4.0, kind="poi")]
+    stream = io.StringIO()
+    assert export.write_geojson(iter(records), stream) == 2
+    collection = json.loads(stream.getvalue())
+    assert [f["geometry"]["coordinates"] for f in collection["features"]] == [[1.0, 2.0], [3.0, 4.0]]
+
+    stream = io.StringIO()
+    assert export.write_ndjson(iter(records), stream) == 2
+    assert len(stream.getvalue().splitlines()) == 2
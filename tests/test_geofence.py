@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+
+from tabs import geofence
+
+def square(name, lon_min, lat_min, lon_max, lat_max):
+    ring = [[lon_min, lat_min], [lon_max, lat_min], [lon_max, lat_max], [lon_min, lat_max], [lon_min, lat_min]]
+    return {"type": "Feature", "properties": {"name": name}, "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+def zones_from(*features):
+    return geofence.load_zones(json.dumps({"type": "FeatureCollection", "features": list(features)}))
+
+@pytest.fixture
+def overlapping():
+    # Zone 1 lies inside zone 0; zone 2 overlaps zone 1's east edge
+    return zones_from(
+        square("outer", 0.0, 0.0, 10.0, 10.0),
+        square("inner", 2.0, 2.0, 4.0, 4.0),
+        square("east", 3.0, 3.0, 12.0, 5.0)
+    )
+
+def test_lowest_zone_index_wins_on_overlaps(overlapping):
+    lats = np.array([2.5, 3.5, 4.5, 9.0])
+    lons = np.array([2.5, 3.5, 11.0, 9.0])
+    result = geofence.classify_points(overlapping, overlapping["key"], lats, lons)
+    assert result.tolist() == [0, 0, 2, 0]
+
+    # Reversed zone order: the inner square now comes first and must win where it overlaps
+    reversed_zones = zones_from(
+        square("east", 3.0, 3.0, 12.0, 5.0),
+        square("inner", 2.0, 2.0, 4.0, 4.0),
+        square("outer", 0.0, 0.0, 10.0, 10.0)
+    )
+    result = geofence.classify_points(reversed_zones, reversed_zones["key"], lats, lons)
+    assert result.tolist() == [1, 0, 0, 2]
+
+def test_points_outside_every_zone(overlapping, monkeypatch):
+    monkeypatch.setattr(geofence, "CLASSIFY_CHUNK_SIZE", 3)
+    lats = np.array([-1.0, 3.0, 20.0, 6.0, 4.0, 50.0, 1.0])
+    lons = np.array([-1.0, 3.0, 20.0, 11.0, 11.0, 50.0, 1.0])
+    result = geofence.classify_points(overlapping, overlapping["key"] + "-chunked", lats, lons)
+    assert result.tolist() == [geofence.OUTSIDE, 0, geofence.OUTSIDE, geofence.OUTSIDE, 2, geofence.OUTSIDE, 0]
+
+def test_crossings_are_sorted_by_entry_order():
+    zones = zones_from(
+        square("c", 8.0, -1.0, 9.0, 1.0),
+        square("a", 1.0, -1.0, 2.0, 1.0),
+        square("b", 4.0, -1.0, 6.0, 1.0),
+        square("off route", 4.0, 5.0, 6.0, 6.0)
+    )
+    # Eastward along the equator, as (lat, lon) pairs like decoded polylines
+    crossings = geofence.zones_crossed(zones, [(0.0, 0.0), (0.0, 10.0)])
+    assert [c["zone"] for c in crossings] == [1, 2, 0]
+    np.testing.assert_allclose([c["entry_fraction"] for c in crossings], [0.1, 0.4, 0.8])
+    np.testing.assert_allclose([c["share_of_route"] for c in crossings], [0.1, 0.2, 0.1])
+
+def test_crossings_skip_empty_intersections(monkeypatch):
+    import shapely
+
+    zones = zones_from(square("a", 1.0, -1.0, 2.0, 1.0), square("b", 4.0, -1.0, 6.0, 1.0))
+    real_intersection = shapely.intersection
+
+    def empty_for_zone_b(line, geometry):
+        if geometry is zones["geometries"][1]:
+            return shapely.LineString()
+        return real_intersection(line, geometry)
+
+    monkeypatch.setattr(shapely, "intersection", empty_for_zone_b)
+    crossings = geofence.zones_crossed(zones, [(0.0, 0.0), (0.0, 10.0)])
+    assert [c["zone"] for c in crossings] == [0]
+
+def test_crossings_need_a_line():
+    zones = zones_from(square("a", 0.0, 0.0, 1.0, 1.0))
+    assert geofence.zones_crossed(zones, [(0.5, 0.5)]) == []
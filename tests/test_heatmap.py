@@ -0,0 +1,60 @@
+import numpy as np
+
+from tabs import heatmap
+
+def geohash(lat, lon, precision):
+    code = heatmap.geohash_encode(np.array([lat]), np.array([lon]), precision)[0]
+    return heatmap.geohash_to_string(code, precision)
+
+def test_geohash_matches_reference_values():
+    assert geohash(42.6, -5.6, 5) == "ezs42"
+    assert geohash(57.64911, 10.40744, 8) == "u4pruydq"
+    assert geohash(-25.382708, -49.265506, 6) == "6gkzwg"
+
+def test_geohash_bounds_contain_the_point():
+    lats = np.array([42.6, -33.8688, 0.0])
+    lons = np.array([-5.6, 151.2093, 0.0])
+    codes = heatmap.geohash_encode(lats, lons, 6)
+    lat_min, lon_min, lat_size, lon_size = heatmap.geohash_bounds(codes, 6)
+    assert np.all((lat_min <= lats) & (lats < lat_min + lat_size))
+    assert np.all((lon_min <= lons) & (lons < lon_min + lon_size))
+
+def test_hex_bin_assigns_points_to_the_nearest_center():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-5, 5, 2000), rng.uniform(-5, 5, 2000)
+    size = 0.7
+    q, r, counts = heatmap.hex_bin(x, y, size)
+    assert counts.sum() == len(x)
+
+    cx, cy = heatmap.hex_centers(q, r, size)
+    for px, py in zip(x[:300], y[:300]):
+        (pq,), (pr,), _ = heatmap.hex_bin(np.array([px]), np.array([py]), size)
+        own_x, own_y = heatmap.hex_centers(pq, pr, size)
+        assert np.hypot(px - own_x, py - own_y) <= np.hypot(px - cx, py - cy).min() + 1e-9
+
+def test_hex_bin_sums_weights():
+    q, r, counts = heatmap.hex_bin(np.zeros(3), np.zeros(3), 1.0, weights=np.array([1.0, 2.0, 3.5]))
+    assert list(zip(q, r, counts)) == [(0, 0, 6.5)]
+
+def test_pyramid_levels_conserve_points():
+    rng = np.random.default_rng(1)
+    lats, lons = rng.uniform(31.4, 31.6, 500), rng.uniform(74.2, 74.4, 500)
+    for grid in ["Geohash", "Hexagons"]:
+        pyramid = heatmap.build_pyramid(lats, lons, grid)
+        for level in pyramid["levels"].values():
+            assert level["counts"].sum() == 500
+
+    geohash_pyramid = heatmap.build_pyramid(lats, lons, "Geohash")
+    finest = heatmap.geohash_encode(lats, lons, 4)
+    assert set(geohash_pyramid["levels"][4]["codes"]) == set(np.unique(finest))
+
+def test_hex_levels_match_binning_the_points_directly():
+    rng = np.random.default_rng(2)
+    lats, lons = rng.uniform(30.0, 33.0, 5000), rng.uniform(73.0, 76.0, 5000)
+    pyramid = heatmap.build_pyramid(lats, lons, "Hexagons")
+    x = lons * np.cos(np.radians(pyramid["lat0"]))
+    for zoom, level in pyramid["levels"].items():
+        q, r, counts = heatmap.hex_bin(x, lats, heatmap.hex_size_deg(zoom))
+        expected = dict(zip(zip(q.tolist(), r.tolist()), counts.tolist()))
+        actual = dict(zip(zip(level["q"].tolist(), level["r"].tolist()), level["counts"].tolist()))
+        assert actual == expected, f"zoom {zoom}"
@@ -0,0 +1,53 @@
+import numpy as np
+import polyline
+import pytest
+
+from tabs import route_analysis
+
+# Two eastward segments along the equator; OSRM-style annotations make them 1 km each
+GEOMETRY = polyline.encode([(0.0, 0.0), (0.0, 0.01), (0.0, 0.02)])
+
+@pytest.fixture
+def profile():
+    return route_analysis.build_profile(GEOMETRY, (1000.0, 1000.0), (100.0, 300.0), 2000.0, 400.0)
+
+def test_position_by_time_interpolates_within_segments(profile):
+    position = route_analysis.position_at(profile, [100.0, 250.0], by="time")
+    np.testing.assert_allclose(position["lon"], [0.01, 0.015])
+    np.testing.assert_allclose(position["lat"], [0.0, 0.0])
+    np.testing.assert_allclose(position["distance"], [1000.0, 1500.0])
+
+def test_position_by_distance_interpolates_time(profile):
+    position = route_analysis.position_at(profile, [500.0, 1500.0], by="distance")
+    np.testing.assert_allclose(position["lon"], [0.005, 0.015])
+    np.testing.assert_allclose(position["time"], [50.0, 250.0])
+
+def test_position_clamps_to_route_ends(profile):
+    position = route_analysis.position_at(profile, [-60.0, 1e6], by="time")
+    np.testing.assert_allclose(position["lon"], [0.0, 0.02])
+    np.testing.assert_allclose(position["distance"], [0.0, 2000.0])
+
+def test_profile_falls_back_to_geometry_without_annotations():
+    profile = route_analysis.build_profile(GEOMETRY, (), (), 4000.0, 400.0)
+    # Equal-length segments share the route's total distance and duration evenly
+    np.testing.assert_allclose(profile["seg_dist"], [2000.0, 2000.0])
+    np.testing.assert_allclose(profile["seg_time"], [200.0, 200.0])
+    np.testing.assert_allclose(profile["cum_time"], [0.0, 200.0, 400.0])
+
+def test_nearest_on_route_distance_and_eta(profile):
+    result = route_analysis.nearest_on_route(profile, [0.001, 0.0], [0.005, 0.03])
+    meters_per_degree = np.pi / 180 * route_analysis.EARTH_RADIUS_M
+    # Beside the first segment's midpoint, and beyond the end of the route
+    np.testing.assert_allclose(result["distance_to_route"], [0.001 * meters_per_degree, 0.01 * meters_per_degree], rtol=1e-6)
+    np.testing.assert_allclose(result["distance_along"], [500.0, 2000.0])
+    np.testing.assert_allclose(result["eta"], [50.0, 400.0])
+
+def test_nearest_on_route_handles_chunking(profile, monkeypatch):
+    monkeypatch.setattr(route_analysis, "MAX_PAIRS_PER_CHUNK", 2)
+    lons = np.linspace(0.0, 0.02, 9)
+    result = route_analysis.nearest_on_route(profile, np.zeros(9), lons)
+    np.testing.assert_allclose(result["eta"], route_analysis.position_at(profile, lons / 0.02 * 2000.0, by="distance")["time"])
+
+def test_nearest_on_route_empty_query(profile):
+    result = route_analysis.nearest_on_route(profile, np.array([]), np.array([]))
+    assert all(len(values) == 0 for values in result.values())
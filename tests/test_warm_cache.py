@@ -0,0 +1,100 @@
+import numpy as np
+import polyline
+import pytest
+
+from tabs import warm_cache
+
+LOCATIONS = [
+    ("depot", "Main Depot, Lahore", 31.5204, 74.3587),
+    ("fort", "Lahore Fort, Lahore", 31.5880, 74.3106),
+    ("zoo", "Lahore Zoo, Lahore", 31.5546, 74.3266)
+]
+
+def route(i, j):
+    (_, _, lat1, lon1), (_, _, lat2, lon2) = LOCATIONS[i], LOCATIONS[j]
+    return {
+        "geometry": polyline.encode([(lat1, lon1), (lat2, lon2)]),
+        "distance": 1000.0 * (i + 1) + j,
+        "duration": 60.0 * (i + 1) + j,
+        "legs": [{"steps": [{"name": f"Road {i}-{j}", "distance": 1000.0}]}]
+    }
+
+@pytest.fixture
+def bundle(tmp_path):
+    routes = {("driving", i, j): route(i, j) for i in range(2) for j in range(2) if i != j}
+    routes[("walking", 0, 2)] = route(0, 2)
+    path = tmp_path / "bundle.bin"
+    warm_cache.write_bundle(str(path), LOCATIONS, routes, ["driving", "walking"])
+    return warm_cache.WarmCacheBundle(str(path))
+
+def test_geocodes_round_trip(bundle):
+    assert list(bundle.geocodes()) == LOCATIONS
+
+def test_routes_round_trip(bundle):
+    _, _, lat1, lon1 = LOCATIONS[0]
+    _, _, lat2, lon2 = LOCATIONS[1]
+    assert bundle.route(lat1, lon1, lat2, lon2, "driving") == route(0, 1)
+    assert bundle.route(lat2, lon2, lat1, lon1, "driving") == route(1, 0)
+
+def test_missing_routes_modes_and_locations(bundle):
+    _, _, lat1, lon1 = LOCATIONS[0]
+    _, _, lat3, lon3 = LOCATIONS[2]
+    assert bundle.route(lat1, lon1, lat3, lon3, "driving") is None  # not precomputed
+    assert bundle.route(lat1, lon1, lat3, lon3, "walking") == route(0, 2)
+    assert bundle.route(lat1, lon1, lat3, lon3, "bicycling") is None
+    assert bundle.route(0.0, 0.0, lat3, lon3, "walking") is None
+
+def test_sections_are_aligned_views(bundle):
+    for offset, _ in bundle.header["sections"].values():
+        assert offset % 8 == 0
+    assert isinstance(bundle.distance, np.ndarray) and bundle.distance.base is not None
+    assert np.isnan(bundle.distance[0, 0, 0])
+
+def test_build_skips_upstream_failures(tmp_path, monkeypatch):
+    import functools
+
+    import geopy.extra.rate_limiter
+    import geopy.geocoders
+    import requests
+    from geopy.exc import GeocoderTimedOut
+
+    from tabs import route as route_tab
+
+    class FlakyNominatim:
+        def __init__(self, **kwargs):
+            pass
+
+        def geocode(self, query, timeout=None):
+            raise GeocoderTimedOut("timed out")
+
+    def flaky_route(start_lat, start_lon, end_lat, end_lon, mode):
+        if (start_lat, end_lat) == (LOCATIONS[0][2], LOCATIONS[1][2]):
+            raise requests.ConnectionError("connection reset")
+        i = next(k for k, loc in enumerate(LOCATIONS) if loc[2] == start_lat)
+        j = next(k for k, loc in enumerate(LOCATIONS) if loc[2] == end_lat)
+        return route(i, j)
+
+    monkeypatch.setattr(geopy.geocoders, "Nominatim", FlakyNominatim)
+    # The rate limiter still retries the geocode; just don't wait between attempts
+    monkeypatch.setattr(geopy.extra.rate_limiter, "RateLimiter",
+                        functools.partial(geopy.extra.rate_limiter.RateLimiter, error_wait_seconds=0))
+    monkeypatch.setattr(route_tab, "fetch_osrm_route", flaky_route)
+
+    seeds = tmp_path / "seeds.csv"
+    rows = [f'"{address}",{lat},{lon}' for _, address, lat, lon in LOCATIONS[:2]] + ['"Nowhere Special",,']
+    seeds.write_text("address,latitude,longitude\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    output = tmp_path / "bundle.bin"
+    warm_cache.build_bundle(str(seeds), str(output), ["driving"], delay=0)
+
+    bundle = warm_cache.WarmCacheBundle(str(output))
+    assert [address for _, address, _, _ in bundle.geocodes()] == [LOCATIONS[0][1], LOCATIONS[1][1]]
+    _, _, lat1, lon1 = LOCATIONS[0]
+    _, _, lat2, lon2 = LOCATIONS[1]
+    assert bundle.route(lat1, lon1, lat2, lon2, "driving") is None  # failed pair skipped
+    assert bundle.route(lat2, lon2, lat1, lon1, "driving") == route(1, 0)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_bundle.bin"
+    path.write_bytes(b"definitely not a bundle")
+    with pytest.raises(ValueError):
+        warm_cache.WarmCacheBundle(str(path))